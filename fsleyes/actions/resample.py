@@ -6,19 +6,55 @@
 #
 """This module provides the :class:`ResampleAction` class, a FSLeyes action
 which allows the user to resample an image to a different resolution.
+
+
+The resampling itself is performed by the :func:`resample` function. If
+`CuPy <https://cupy.dev/>`_ is installed, the interpolation is
+performed on the GPU. Otherwise, nearest neighbour resampling is performed
+by :func:`_resampleNearest`, linear resampling by :func:`_resampleLinear`
+(or :func:`_resampleLinearUint8` for an 8 bit output), and cubic resampling
+by :func:`_resampleCubic`. All other interpolation settings are passed
+through to the :meth:`.Image.resample` method.
+
+
+When all volumes of a 4D image are resampled, the volumes are resampled
+concurrently on a pool of threads by the :func:`_resampleVolumes` function.
+
+
+CuPy and ``scipy.ndimage`` are not imported until they are needed, so that
+importing this module (and creating a :class:`ResampleAction`) is cheap.
 """
 
 
+import multiprocessing
+import multiprocessing.pool as mppool
+import tempfile
+
 import          wx
 import numpy as np
 
 import fsleyes_widgets.floatspin as floatspin
 import fsl.data.image            as fslimage
+import fsl.utils.memoize         as memoize
+import fsl.utils.transform       as transform
 import fsleyes.strings           as strings
 import fsleyes.tooltips          as tooltips
 from . import                       base
 
 
+MEMMAP_THRESHOLD = 1073741824
+"""Resampled 4D images which are larger than this many bytes are stored in a
+temporary memory-mapped file, rather than in memory. See
+:func:`_resampleVolumes`.
+"""
+
+
+BLOCK_SIZE = 262144
+"""Approximate size, in bytes, of the blocks of data which are processed
+at a time by the CPU resampling functions. See :func:`_resamplePass`.
+"""
+
+
 class ResampleAction(base.Action):
     def __init__(self, overlayList, displayCtx, frame):
         """Create a ``ResampleAction``.
@@ -86,17 +122,18 @@ class ResampleAction(base.Action):
         interp    = dlg.GetInterpolation()
         dtype     = dlg.GetDataType()
         smoothing = dlg.GetSmoothing()
-        interp    = {'nearest' : 0, 'linear' : 1, 'cubic' : 3}[interp]
+        allvols   = dlg.GetAllVolumes()
         name      = '{}_resampled'.format(ovl.name)
 
-        if ovl.ndims == 3: slc = None
-        else:              slc = opts.index()
+        if ovl.ndims == 3 or allvols: slc = None
+        else:                         slc = opts.index()
 
-        resampled, xform = ovl.resample(newShape,
-                                        sliceobj=slc,
-                                        dtype=dtype,
-                                        order=interp,
-                                        smooth=smoothing)
+        resampled, xform = resample(ovl,
+                                    newShape,
+                                    sliceobj=slc,
+                                    dtype=dtype,
+                                    order=interp,
+                                    smooth=smoothing)
         resampled        = fslimage.Image(resampled,
                                           xform=xform,
                                           header=ovl.header,
@@ -105,6 +142,878 @@ class ResampleAction(base.Action):
         self.__overlayList.append(resampled)
 
 
+def resample(image,
+             newShape,
+             sliceobj=None,
+             dtype=None,
+             order=1,
+             smooth=True):
+    """Returns a copy of the data in the given :class:`.Image`, resampled to
+    the specified ``newShape``. The arguments and return value are the same
+    as for :meth:`.Image.resample`.
+
+    If ``sliceobj is None``, and ``image`` is 4D, but ``newShape`` only
+    contains three values, all of the volumes in the image are resampled by
+    :func:`_resampleVolumes`.
+
+    If CuPy is available, the resampling is performed on the GPU by
+    :func:`_resampleGPU`. Otherwise, nearest neighbour resampling is
+    performed by :func:`_resampleNearest`, linear resampling is performed by
+    :func:`_resampleLinear` (or :func:`_resampleLinearUint8` for a ``uint8``
+    output), cubic resampling is performed by :func:`_resampleCubic`, and
+    this function just calls :meth:`.Image.resample` for all other
+    interpolation settings.
+    """
+
+    if sliceobj is None and image.ndims == 4 and len(newShape) == 3:
+        return _resampleVolumes(image, newShape, dtype, order, smooth)
+
+    return _resampleVolume(image,
+                           newShape,
+                           sliceobj,
+                           dtype,
+                           order,
+                           smooth,
+                           multiprocessing.cpu_count())
+
+
+def _resampleVolume(image, newShape, sliceobj, dtype, order, smooth, nthreads):
+    """Used by :func:`resample` and :func:`_resampleVolumes`. Resamples a
+    single volume of the given ``image``.
+
+    The CPU resampling functions split their work across a pool of
+    ``nthreads`` threads, via the :func:`_resamplePass` function.
+
+    :returns: A tuple containing the resampled data, and its voxel-to-world
+              transformation.
+    """
+
+    if sliceobj is None: sliceobj = slice(None)
+    if dtype    is None: dtype    = image.dtype
+
+    data     = image[sliceobj]
+    oldShape = np.array(data.shape, dtype=np.float64)
+    newShape = np.array(newShape,   dtype=np.float64)
+
+    if len(oldShape) != len(newShape):
+        raise ValueError('Shapes don\'t match')
+
+    # The shape is not changing, so there is
+    # nothing to interpolate or smooth - we
+    # just need a copy of the data, cast to
+    # the requested data type.
+    if np.all(np.isclose(oldShape, newShape)):
+        return np.array(data, dtype=dtype), image.voxToWorldMat
+
+    kernel = _KERNELS.get(order)
+    cupy   = _importCuPy()[0]
+
+    if cupy is None and kernel is None:
+        return image.resample(newShape,
+                              sliceobj=sliceobj,
+                              dtype=dtype,
+                              order=order,
+                              smooth=smooth)
+
+    ratio    = oldShape / newShape
+    newShape = tuple(int(n) for n in np.round(newShape))
+
+    # The resampling routines need a
+    # contiguous array, so that their inner
+    # loops have unit stride. NIFTI data is
+    # usually stored in fortran order, in
+    # which case we can resample the (C
+    # contiguous) transpose of the data,
+    # rather than copying it.
+    data      = np.asarray(data, dtype=dtype)
+    transpose = data.flags.f_contiguous and not data.flags.c_contiguous
+
+    if transpose:
+        data     = data.T
+        newShape = newShape[::-1]
+        ratio    = ratio[::-1]
+    else:
+        data = np.ascontiguousarray(data)
+
+    if cupy is not None:
+        data = _resampleGPU(data, newShape, ratio, order, smooth)
+
+    else:
+        if nthreads > 1: pool = mppool.ThreadPool(nthreads)
+        else:            pool = None
+
+        try:
+            data = kernel(data, newShape, ratio, smooth, pool)
+        finally:
+            if pool is not None:
+                pool.close()
+
+    if transpose:
+        data  = data.T
+        ratio = ratio[::-1]
+
+    # Construct an affine transform which
+    # puts the resampled image into the
+    # same world coordinate system as the
+    # source image.
+    xform = transform.scaleOffsetXform(ratio, 0)
+    xform = transform.concat(image.voxToWorldMat, xform)
+
+    return data, xform
+
+
+def _resampleVolumes(image, newShape, dtype, order, smooth):
+    """Used by :func:`resample`. Resamples every volume of the given 4D
+    :class:`.Image`.
+
+    Each volume is resampled independently by a call to
+    :func:`_resampleVolume`. The calls are run concurrently on a pool of
+    threads - the ``numpy`` and
+    ``scipy.ndimage`` routines which do the work release the GIL, so this
+    scales well with the number of available cores.
+
+    The volumes are streamed - only one input and output volume per thread
+    is held in memory at any one time. Each resampled volume is written
+    straight into a pre-allocated 4D output array, which is stored in a
+    temporary memory-mapped file if it is larger than
+    :data:`MEMMAP_THRESHOLD`.
+
+    :returns: A tuple containing the resampled 4D data, and its
+              voxel-to-world transformation.
+    """
+
+    nvols = image.shape[3]
+    out   = None
+    xform = None
+
+    def resampleVolume(vol):
+        # Volumes are already being resampled in
+        # parallel, so each individual volume
+        # is resampled on a single thread.
+        slc = (slice(None), slice(None), slice(None), vol)
+        return _resampleVolume(image, newShape, slc, dtype, order, smooth, 1)
+
+    pool = mppool.ThreadPool(min(nvols, multiprocessing.cpu_count()))
+
+    try:
+        results = pool.imap(resampleVolume, range(nvols))
+
+        for vol, (data, xform) in enumerate(results):
+            if out is None:
+                out = _allocateVolumes(data.shape + (nvols,), data.dtype)
+            out[..., vol] = data
+    finally:
+        pool.close()
+
+    return out, xform
+
+
+@memoize.memoize
+def _importCuPy():
+    """Imports CuPy on first use - importing CuPy initialises the CUDA
+    runtime, which is slow, so it is not done when this module is imported.
+
+    :returns: A tuple containing the ``cupy`` and ``cupyx.scipy.ndimage``
+              modules, or ``(None, None)`` if CuPy is not installed, or
+              if there is no usable CUDA device, in which case resampling
+              is performed on the CPU.
+    """
+    try:
+        import cupy
+        import cupyx.scipy.ndimage as cupyndimage
+    except ImportError:
+        return None, None
+
+    # CuPy may be installed on a machine
+    # which has no CUDA device or driver,
+    # in which case any CuPy call will fail
+    try:
+        if cupy.cuda.runtime.getDeviceCount() < 1:
+            return None, None
+    except Exception:
+        return None, None
+
+    return cupy, cupyndimage
+
+
+def _allocateVolumes(shape, dtype):
+    """Used by :func:`_resampleVolumes`. Allocates an array to store a
+    resampled 4D image. The array is in Fortran order, so that each volume is
+    contiguous. If the array is larger than :data:`MEMMAP_THRESHOLD`, it is
+    backed by an anonymous temporary file, which is deleted when the array is
+    no longer in use.
+    """
+
+    nbytes = np.prod(shape) * np.dtype(dtype).itemsize
+
+    if nbytes <= MEMMAP_THRESHOLD:
+        return np.empty(shape, dtype=dtype, order='F')
+
+    return np.memmap(tempfile.TemporaryFile(),
+                     dtype=dtype,
+                     mode='w+',
+                     shape=shape,
+                     order='F')
+
+
+def _resampleGPU(data, newShape, ratio, order, smooth):
+    """Used by :func:`resample`. Resamples ``data`` on the GPU using CuPy.
+
+    The data is uploaded once, optionally smoothed, and then interpolated
+    with ``cupyx.scipy.ndimage.affine_transform``. The output voxel
+    coordinates are a pure scaling (by ``ratio``) of the input voxel
+    coordinates, so the transformation is passed as a 1D (diagonal) matrix.
+    This means that the interpolation coordinates and weights only need to
+    be calculated separately along each axis, and a dense coordinate grid
+    for every output voxel is never created.
+
+    :arg data:     ``numpy`` array containing the data to resample
+    :arg newShape: Output shape, a tuple of integers
+    :arg ratio:    Ratio of old to new shape along each axis
+    :arg order:    Spline interpolation order
+    :arg smooth:   If ``True``, the data is smoothed with a gaussian filter
+                   along each down-sampled axis, in the same manner as
+                   :meth:`.Image.resample`.
+    :returns:      A ``numpy`` array containing the resampled data.
+    """
+
+    cupy, cupyndimage = _importCuPy()
+
+    gpudata = cupy.asarray(data)
+
+    if order > 0 and smooth:
+        gpudata = cupyndimage.gaussian_filter(gpudata, _smoothingSigma(ratio))
+
+    gpudata = cupyndimage.affine_transform(gpudata,
+                                           cupy.asarray(ratio,
+                                                        dtype=cupy.float64),
+                                           output_shape=newShape,
+                                           order=order,
+                                           mode='constant')
+
+    return cupy.asnumpy(gpudata)
+
+
+def _resampleNearest(data, newShape, ratio, smooth, pool=None):
+    """Used by :func:`resample`. Performs nearest neighbour resampling of
+    ``data`` on the CPU.
+
+    As the resampling transform is a pure scaling along each axis, the input
+    voxel index for every output voxel can be calculated independently
+    along each axis. The resampled data is then gathered from ``data`` one
+    axis at a time, which is much faster than the general purpose
+    ``scipy.ndimage`` interpolation routines.
+
+    Output voxels which lie beyond the edge of the input are set to zero
+    (see :func:`_insideLength`).
+
+    :arg data:     ``numpy`` array containing the data to resample
+    :arg newShape: Output shape, a tuple of integers
+    :arg ratio:    Ratio of old to new shape along each axis
+    :arg smooth:   Ignored - smoothing is never applied with nearest
+                   neighbour interpolation.
+    :arg pool:     Thread pool to pass to :func:`_resamplePass`.
+    :returns:      A ``numpy`` array containing the resampled data.
+    """
+
+    for axis in _passOrder(ratio):
+
+        oldlen  = data.shape[axis]
+        newlen  = newShape[axis]
+        idx     = _nearestIndices(oldlen, newlen, ratio[axis])
+        ninside = _insideLength(  oldlen, newlen, ratio[axis])
+
+        def nearestPass(chunk, axis=axis, idx=idx, ninside=ninside):
+            return _zeroOutside(chunk.take(idx, axis=axis), axis, ninside)
+
+        data = _resamplePass(pool, nearestPass, data, axis, newlen,
+                             data.dtype)
+
+    return data
+
+
+@memoize.memoize
+def _nearestIndices(oldlen, newlen, ratio):
+    """Used by :func:`_resampleNearest`. Calculates the input voxel index
+    for every output voxel along a single axis.
+
+    The result is cached, as the same indices are used for every volume
+    when all of the volumes in a 4D image are resampled (see
+    :func:`_resampleVolumes`).
+
+    :arg oldlen: Length of the axis in the input
+    :arg newlen: Length of the axis in the output
+    :arg ratio:  Ratio of ``oldlen`` to ``newlen``
+    :returns:    A ``numpy`` array of length ``newlen``, containing indices
+                 into the input axis. Indices for output voxels which lie
+                 beyond the edge of the input are clamped to the last input
+                 voxel - these output voxels are later set to zero.
+    """
+    idx = np.floor(np.arange(newlen) * ratio + 0.5).astype(np.intp)
+    return np.clip(idx, 0, oldlen - 1)
+
+
+def _resampleLinear(data, newShape, ratio, smooth, pool=None):
+    """Used by :func:`resample`. Performs linear resampling of ``data`` on
+    the CPU.
+
+    As the resampling transform is a pure scaling along each axis, linear
+    interpolation is separable, and is performed as a sequence of 1D
+    linear interpolations, one along each axis. Each output voxel therefore
+    requires 2 weighted input voxels per axis, rather than the 8 required
+    by full trilinear interpolation. The interpolation is performed in the
+    precision returned by :func:`_workingType`.
+
+    If ``smooth`` is ``True``, the gaussian smoothing filter is not applied
+    as a separate step - it is folded into the interpolation weights for
+    each axis by :func:`_linearWeights`, so each pass reads and writes the
+    data only once.
+
+    Output voxels which lie beyond the edge of the input are set to zero
+    (see :func:`_insideLength`). Integer outputs are rounded, and clipped to
+    the range of the data type. ``uint8`` data is passed to the
+    :func:`_resampleLinearUint8` function.
+
+    :arg data:     ``numpy`` array containing the data to resample
+    :arg newShape: Output shape, a tuple of integers
+    :arg ratio:    Ratio of old to new shape along each axis
+    :arg smooth:   If ``True``, the data is smoothed with a gaussian filter
+                   along each down-sampled axis, in the same manner as
+                   :meth:`.Image.resample`.
+    :arg pool:     Thread pool to pass to :func:`_resamplePass`.
+    :returns:      A ``numpy`` array containing the resampled data, with the
+                   same data type as ``data``.
+    """
+
+    if data.dtype == np.uint8:
+        return _resampleLinearUint8(data, newShape, ratio, smooth, pool)
+
+    dtype = data.dtype
+    wtype = _workingType(dtype)
+    sigma = _smoothingSigma(ratio)
+
+    for axis in _passOrder(ratio):
+
+        oldlen           = data.shape[axis]
+        newlen           = newShape[axis]
+        ninside          = _insideLength(oldlen, newlen, ratio[axis])
+        indices, weights = _linearWeights(oldlen,
+                                          newlen,
+                                          ratio[axis],
+                                          sigma[axis] if smooth else 0)
+
+        wshape       = [1] * data.ndim
+        wshape[axis] = newlen
+        weights      = [w.astype(wtype).reshape(wshape) for w in weights]
+
+        def linearPass(chunk,
+                       axis=axis,
+                       indices=indices,
+                       weights=weights,
+                       ninside=ninside):
+            result = _sumTaps(chunk, axis, indices, weights)
+            return _zeroOutside(result, axis, ninside)
+
+        data = _resamplePass(pool, linearPass, data, axis, newlen, wtype)
+
+    return _castResult(data, dtype)
+
+
+def _resampleLinearUint8(data, newShape, ratio, smooth, pool=None):
+    """Used by :func:`resample`. Performs linear resampling of ``uint8``
+    ``data`` on the CPU, using 8 bit fixed-point arithmetic.
+
+    The interpolation is separable, so it is performed as a sequence of 1D
+    linear interpolations, one along each axis. The interpolation weights
+    (which, if ``smooth`` is ``True``, include the gaussian smoothing
+    filter - see :func:`_linearWeights`) are quantised to integers which
+    sum to 256, so every pass can be calculated with ``uint16`` intermediate
+    values, with the result rounded back to ``uint8``. This uses half of the
+    memory bandwidth of a ``float32`` pipeline.
+
+    Output voxels which lie beyond the edge of the input are set to zero
+    (see :func:`_insideLength`).
+
+    :arg data:     ``uint8`` ``numpy`` array containing the data to resample
+    :arg newShape: Output shape, a tuple of integers
+    :arg ratio:    Ratio of old to new shape along each axis
+    :arg smooth:   If ``True``, the data is smoothed with a gaussian filter
+                   along each down-sampled axis, in the same manner as
+                   :meth:`.Image.resample`.
+    :arg pool:     Thread pool to pass to :func:`_resamplePass`.
+    :returns:      A ``uint8`` ``numpy`` array containing the resampled data.
+    """
+
+    sigma = _smoothingSigma(ratio)
+
+    for axis in _passOrder(ratio):
+
+        oldlen           = data.shape[axis]
+        newlen           = newShape[axis]
+        ninside          = _insideLength(oldlen, newlen, ratio[axis])
+        indices, weights = _linearWeights(oldlen,
+                                          newlen,
+                                          ratio[axis],
+                                          sigma[axis] if smooth else 0)
+
+        # Quantise the weights for each output
+        # voxel so that they sum to exactly 256,
+        # giving any rounding error to the
+        # largest weight.
+        qweights = np.round(weights * 256).astype(np.int32)
+        cols     = np.arange(newlen)
+        largest  = np.argmax(weights, axis=0)
+        qweights[largest, cols] += 256 - qweights.sum(axis=0)
+
+        wshape       = [1] * data.ndim
+        wshape[axis] = newlen
+        qweights     = [w.astype(np.uint16).reshape(wshape) for w in qweights]
+
+        def linearPass(chunk,
+                       axis=axis,
+                       indices=indices,
+                       weights=qweights,
+                       ninside=ninside):
+            result  = _sumTaps(chunk, axis, indices, weights, np.uint16)
+            result += 128
+            result >>= 8
+            return _zeroOutside(result, axis, ninside)
+
+        data = _resamplePass(pool, linearPass, data, axis, newlen, np.uint8)
+
+    return data
+
+
+@memoize.memoize
+def _linearWeights(oldlen, newlen, ratio, sigma):
+    """Used by the linear resampling functions. Calculates the input voxel
+    indices, and their interpolation weights, for every output voxel along
+    a single axis. The result is cached, as the same weights are used for
+    every volume when all of the volumes in a 4D image are resampled.
+
+    If ``sigma`` is greater than zero, the weights of a gaussian filter with
+    that standard deviation are convolved into the two linear interpolation
+    weights (see :func:`_smoothTaps`), so that smoothing and interpolation
+    are performed as a single weighted sum. Otherwise each output voxel has
+    two input voxels.
+
+    :arg oldlen: Length of the axis in the input
+    :arg newlen: Length of the axis in the output
+    :arg ratio:  Ratio of ``oldlen`` to ``newlen``
+    :arg sigma:  Standard deviation of the gaussian smoothing filter, in
+                 input voxels, or ``0`` for no smoothing.
+    :returns:    A tuple containing:
+
+                  - A ``(ntaps, newlen)`` array of input voxel indices,
+                    reflected at the boundaries.
+                  - A ``(ntaps, newlen)`` array of weights.
+    """
+
+    coords  = np.clip(np.arange(newlen) * ratio, 0, oldlen - 1)
+    base    = np.floor(coords).astype(np.intp)
+    t       = coords - base
+    weights = np.vstack((1 - t, t))
+
+    base, weights = _smoothTaps(base, weights, sigma)
+    indices       = base + np.arange(len(weights))[:, np.newaxis]
+
+    # Reflect indices which lie outside of the
+    # input, in the same manner as the default
+    # scipy.ndimage.gaussian_filter mode
+    period  = 2 * oldlen
+    indices = indices % period
+    indices = np.where(indices >= oldlen, period - 1 - indices, indices)
+
+    return indices, weights
+
+
+def _resampleCubic(data, newShape, ratio, smooth, pool=None):
+    """Used by :func:`resample`. Performs cubic B-spline resampling of
+    ``data`` on the CPU.
+
+    Cubic B-spline interpolation is separable, so it is performed as a
+    sequence of 1D passes, one along each axis. In each pass, the data is
+    first passed through the causal/anti-causal B-spline pre-filter along
+    the axis (``scipy.ndimage.spline_filter1d``), and then each output voxel
+    is calculated as a weighted sum of the four nearest pre-filtered input
+    voxels. This requires 4 multiplies per output voxel per axis, rather
+    than the 64 required to evaluate the full 3D tensor-product spline. The
+    interpolation is performed in the precision returned by
+    :func:`_workingType`.
+
+    If ``smooth`` is ``True``, the data is passed through a 1D gaussian
+    filter along the axis before it is pre-filtered. Unlike in
+    :func:`_resampleLinear`, the filter is not folded into the interpolation
+    weights, as the gaussian and B-spline pre-filters handle the data
+    boundaries differently, and so do not commute near the edges.
+
+    Output voxels which lie beyond the edge of the input are set to zero
+    (see :func:`_insideLength`). Within the input, the data is mirrored
+    beyond its edges, which is consistent with the boundary condition used
+    by the pre-filter. Integer outputs are rounded, and clipped to the range
+    of the data type.
+
+    :arg data:     ``numpy`` array containing the data to resample
+    :arg newShape: Output shape, a tuple of integers
+    :arg ratio:    Ratio of old to new shape along each axis
+    :arg smooth:   If ``True``, the data is smoothed with a gaussian filter
+                   along each down-sampled axis, in the same manner as
+                   :meth:`.Image.resample`.
+    :arg pool:     Thread pool to pass to :func:`_resamplePass`.
+    :returns:      A ``numpy`` array containing the resampled data, with the
+                   same data type as ``data``.
+    """
+
+    import scipy.ndimage as ndimage
+
+    dtype = data.dtype
+    wtype = _workingType(dtype)
+    sigma = _smoothingSigma(ratio)
+
+    for axis in _passOrder(ratio):
+
+        oldlen           = data.shape[axis]
+        newlen           = newShape[axis]
+        ninside          = _insideLength(oldlen, newlen, ratio[axis])
+        indices, weights = _cubicWeights(oldlen, newlen, ratio[axis])
+        asigma           = sigma[axis] if smooth else 0
+        wshape           = [1] * data.ndim
+        wshape[axis]     = newlen
+        weights          = [w.astype(wtype).reshape(wshape) for w in weights]
+
+        def cubicPass(chunk,
+                      axis=axis,
+                      indices=indices,
+                      weights=weights,
+                      ninside=ninside,
+                      sigma=asigma):
+            if sigma > 0:
+                chunk = ndimage.gaussian_filter1d(chunk,
+                                                  sigma,
+                                                  axis=axis,
+                                                  output=wtype,
+                                                  mode='reflect')
+            chunk  = ndimage.spline_filter1d(chunk,
+                                             order=3,
+                                             axis=axis,
+                                             output=wtype)
+            result = _sumTaps(chunk, axis, indices, weights)
+            return _zeroOutside(result, axis, ninside)
+
+        data = _resamplePass(pool, cubicPass, data, axis, newlen, wtype)
+
+    return _castResult(data, dtype)
+
+
+@memoize.memoize
+def _cubicWeights(oldlen, newlen, ratio):
+    """Used by :func:`_resampleCubic`. Calculates the indices of the input
+    voxels which contribute to every output voxel along a single axis,
+    and their cubic B-spline weights. The result is cached, as the same
+    weights are used for every volume when all of the volumes in a 4D image
+    are resampled.
+
+    Each output voxel has four input voxels.
+
+    :arg oldlen: Length of the axis in the input
+    :arg newlen: Length of the axis in the output
+    :arg ratio:  Ratio of ``oldlen`` to ``newlen``
+    :returns:    A tuple containing:
+
+                  - A ``(4, newlen)`` array of input voxel indices,
+                    mirrored at the boundaries.
+                  - A ``(4, newlen)`` array of weights.
+
+    The tables are stored tap-major, matching the order in which they are
+    accessed by :func:`_sumTaps` (all output voxels for the first tap,
+    then all output voxels for the second tap, and so on), so that each
+    row is a contiguous array which can be used without being copied.
+    """
+
+    coords = np.clip(np.arange(newlen) * ratio, 0, oldlen - 1)
+    base   = np.floor(coords).astype(np.intp)
+    t      = coords - base
+
+    weights = np.vstack(((1 - t) ** 3,
+                         3 * t ** 3 - 6 * t ** 2 + 4,
+                         -3 * t ** 3 + 3 * t ** 2 + 3 * t + 1,
+                         t ** 3)) / 6.0
+
+    indices = base - 1 + np.arange(4)[:, np.newaxis]
+
+    # Mirror indices which lie
+    # outside of the input
+    if oldlen == 1:
+        indices[:] = 0
+    else:
+        period  = 2 * (oldlen - 1)
+        indices = np.abs(indices) % period
+        indices = np.where(indices >= oldlen, period - indices, indices)
+
+    return indices, weights
+
+
+def _smoothTaps(base, weights, sigma):
+    """Used by :func:`_linearWeights`. Convolves a set of 1D interpolation
+    weights with a gaussian filter.
+
+    Applying a gaussian filter to the data and then interpolating it is
+    equivalent to interpolating it with a kernel which is the convolution of
+    the gaussian and the interpolation kernel. Doing the latter means that
+    the data only needs to be read once, and that the filter only needs to
+    be evaluated at the output voxels, rather than at every input voxel.
+
+    :arg base:    Index of the first input voxel for each output voxel.
+    :arg weights: A ``(ntaps, newlen)`` array containing the weights for
+                  input voxels ``base``, ``base + 1``, ..., ``base + ntaps
+                  - 1``.
+    :arg sigma:   Standard deviation of the gaussian filter. The filter is
+                  truncated at four standard deviations, as in
+                  ``scipy.ndimage.gaussian_filter``. If ``0``, ``base`` and
+                  ``weights`` are returned unmodified.
+    :returns:     A tuple containing the new ``base`` indices, and the new
+                  ``(ntaps + 2 * radius, newlen)`` weights, where
+                  ``radius`` is the radius of the gaussian filter.
+    """
+
+    if sigma <= 0:
+        return base, weights
+
+    radius  = int(4.0 * sigma + 0.5)
+    gauss   = np.exp(-0.5 * (np.arange(-radius, radius + 1) / sigma) ** 2)
+    gauss   = gauss / gauss.sum()
+    ntaps   = len(weights)
+    smoothw = np.zeros((ntaps + 2 * radius, weights.shape[1]))
+
+    for tap in range(ntaps):
+        smoothw[tap:tap + 2 * radius + 1] += np.outer(gauss, weights[tap])
+
+    return base - radius, smoothw
+
+
+@memoize.memoize
+def _insideLength(oldlen, newlen, ratio):
+    """Used by the CPU resampling functions. Returns the number of output
+    voxels along an axis which lie within the input.
+
+    When up-sampling, the last few output voxels along an axis can lie
+    beyond the centre of the last input voxel. These voxels are set to
+    zero, which is the boundary rule used by :meth:`.Image.resample` and
+    by the GPU resampling path (``mode='constant'``).
+
+    :arg oldlen: Length of the axis in the input
+    :arg newlen: Length of the axis in the output
+    :arg ratio:  Ratio of ``oldlen`` to ``newlen``
+    """
+    coords = np.arange(newlen) * ratio
+    return int(np.count_nonzero(coords <= oldlen - 1))
+
+
+def _zeroOutside(data, axis, ninside):
+    """Used by the CPU resampling functions. Sets all voxels of ``data``
+    beyond the first ``ninside`` voxels along ``axis`` to zero (see
+    :func:`_insideLength`). ``data`` is modified in place, and returned.
+    """
+
+    if ninside < data.shape[axis]:
+        slc       = [slice(None)] * data.ndim
+        slc[axis] = slice(ninside, None)
+        data[tuple(slc)] = 0
+
+    return data
+
+
+def _sumTaps(data, axis, indices, weights, dtype=None):
+    """Used by the linear and cubic resampling functions. Calculates a
+    weighted sum of input voxels along one axis of ``data``.
+
+    :arg data:    ``numpy`` array to resample
+    :arg axis:    Axis to resample along
+    :arg indices: Sequence of index arrays, one for each tap, as returned by
+                  :func:`_linearWeights` or :func:`_cubicWeights`.
+    :arg weights: Sequence of weight arrays, one for each tap, shaped so
+                  that they broadcast along ``axis``.
+    :arg dtype:   Type to cast the input voxels to before they are weighted.
+                  If not provided, the input voxels are not cast.
+    :returns:     A ``numpy`` array containing the weighted sum.
+    """
+
+    result = None
+
+    for idxs, w in zip(indices, weights):
+        tap = data.take(idxs, axis=axis)
+        if dtype is not None:
+            tap = tap.astype(dtype)
+        if result is None:
+            result  = tap * w
+        else:
+            result += tap * w
+
+    return result
+
+
+_KERNELS = {0 : _resampleNearest,
+            1 : _resampleLinear,
+            3 : _resampleCubic}
+"""CPU resampling functions, keyed by interpolation order. All of these
+functions accept the same arguments - ``(data, newShape, ratio, smooth,
+pool)``. Other interpolation orders are passed to :meth:`.Image.resample`.
+"""
+
+
+def _passOrder(ratio):
+    """Used by the CPU resampling functions. Returns the order in which the
+    axes should be resampled. Axes which are down-sampled the most are
+    resampled first, so that the later passes have the least amount of data
+    to process.
+    """
+    return [int(a) for a in np.argsort(ratio)[::-1]]
+
+
+def _resamplePass(pool, func, data, axis, newlen, dtype):
+    """Used by the CPU resampling functions. Resamples ``data`` along a
+    single axis, using the given function.
+
+    The data is split into blocks along the outermost of the other axes, and
+    each block is resampled separately, being written directly into the
+    output array. The blocks are small enough (see :data:`BLOCK_SIZE`) that
+    the intermediate arrays created by ``func`` for each block stay resident
+    in the CPU cache. If a ``pool`` is provided, the blocks are resampled
+    concurrently.
+
+    :arg pool:   A ``multiprocessing.pool.ThreadPool``, or ``None``.
+    :arg func:   Function which accepts an array, and returns a copy which is
+                 resampled to length ``newlen`` along ``axis``.
+    :arg data:   ``numpy`` array to resample
+    :arg axis:   Axis to resample along
+    :arg newlen: New length of the axis
+    :arg dtype:  Output data type
+    :returns:    A ``numpy`` array containing the resampled data.
+    """
+
+    if data.ndim < 2:
+        return np.asarray(func(data), dtype=dtype)
+
+    dtype       = np.dtype(dtype)
+    split       = [a for a in range(data.ndim) if a != axis][0]
+    shape       = list(data.shape)
+    shape[axis] = newlen
+    out         = np.empty(shape, dtype=dtype)
+    nbytes      = out.size * max(dtype.itemsize, data.dtype.itemsize)
+    nblocks     = int(np.ceil(nbytes / float(BLOCK_SIZE)))
+
+    if pool is not None:
+        nblocks = max(nblocks, multiprocessing.cpu_count())
+
+    nblocks = max(1, min(nblocks, data.shape[split]))
+    bounds  = np.linspace(0, data.shape[split], nblocks + 1)
+    bounds  = np.unique(np.round(bounds).astype(np.intp))
+
+    def resampleBlock(i):
+        slc        = [slice(None)] * data.ndim
+        slc[split] = slice(bounds[i], bounds[i + 1])
+        slc        = tuple(slc)
+        out[slc]   = func(data[slc])
+
+    if pool is None:
+        for i in range(len(bounds) - 1):
+            resampleBlock(i)
+    else:
+        pool.map(resampleBlock, range(len(bounds) - 1))
+
+    return out
+
+
+def _workingType(dtype):
+    """Used by the CPU resampling functions. Returns the floating point type
+    in which data of the given ``dtype`` should be interpolated.
+
+    ``float32`` is used for ``float32`` data, and for integer types which
+    can be represented exactly in ``float32``, as it halves the memory
+    bandwidth used by the (memory-bound) interpolation passes. ``float64``
+    is used for all other types.
+    """
+
+    dtype = np.dtype(dtype)
+
+    if dtype == np.float32:
+        return np.dtype(np.float32)
+    if issubclass(dtype.type, np.integer) and dtype.itemsize <= 2:
+        return np.dtype(np.float32)
+
+    return np.dtype(np.float64)
+
+
+def _castResult(data, dtype):
+    """Used by the CPU resampling functions. Casts interpolated floating
+    point ``data`` to the given ``dtype``. Data which is being cast to an
+    integer type is rounded, and clipped to the range of the type.
+    """
+
+    dtype = np.dtype(dtype)
+
+    if issubclass(dtype.type, np.integer):
+        info = np.iinfo(dtype)
+        data = np.clip(np.round(data), info.min, info.max)
+
+    return data.astype(dtype)
+
+
+def _smoothingSigma(ratio):
+    """Calculates the standard deviations of the gaussian filter which is
+    applied before interpolation when smoothing is enabled. The data is only
+    smoothed along axes which are being down-sampled, in the same manner as
+    :meth:`.Image.resample`.
+    """
+    sigma                = np.array(ratio, dtype=np.float64)
+    sigma[ratio <  1.1]  = 0
+    sigma[ratio >= 1.1] *= 0.425
+    return sigma
+
+
+_INTERP_CHOICES = (('linear',  1),
+                   ('nearest', 0),
+                   ('cubic',   3))
+"""Interpolation options shown in the :class:`ResampleDialog`, as
+``(label key, spline order)`` pairs.
+"""
+
+
+_DTYPE_CHOICES = (('float',  np.dtype(np.float32)),
+                  ('uchar',  np.dtype(np.uint8)),
+                  ('sshort', np.dtype(np.int16)),
+                  ('sint',   np.dtype(np.int32)),
+                  ('double', np.dtype(np.float64)))
+"""Data type options shown in the :class:`ResampleDialog`, as
+``(label key, numpy.dtype)`` pairs.
+"""
+
+
+@memoize.memoize
+def _dialogStrings(cls):
+    """Used by the :class:`ResampleDialog`. Looks up all of the labels and
+    tooltips used by the dialog. The result is cached, so the lookups are
+    only performed the first time that a dialog of the given type is
+    created.
+
+    :arg cls: The dialog class
+    :returns: A tuple containing two dicts, ``{key : label}``, and
+              ``{key : tooltip}``.
+    """
+
+    labelKeys = ['ok', 'reset', 'cancel',
+                 'origVoxels', 'origPixdims', 'newVoxels', 'newPixdims',
+                 'interpolation', 'dtype', 'smoothing', 'allVolumes']
+    labelKeys = labelKeys + [c[0] for c in _INTERP_CHOICES] \
+                          + [c[0] for c in _DTYPE_CHOICES]
+    tipKeys   = ['interpolation', 'dtype', 'smoothing', 'allVolumes']
+
+    labels = dict((k, strings.labels[cls, k]) for k in labelKeys)
+    tips   = dict((k, tooltips.misc[ cls, k]) for k in tipKeys)
+
+    return labels, tips
+
+
 class ResampleDialog(wx.Dialog):
     """The ``ResampleDialog`` is used by the ``ResampleAction`` to prompt the
     user for a new resampled image shape. It contains controls allowing the
@@ -117,7 +1026,8 @@ class ResampleDialog(wx.Dialog):
 
         :arg parent: ``wx`` parent object
         :arg title:  Dialog title
-        :arg shape:  The original image shape (a tuple of three integers)
+        :arg shape:  The original image shape (a tuple of three or four
+                     integers)
         :arg pixdim: The original image pixdims (a tuple of three floats)
         """
 
@@ -126,16 +1036,18 @@ class ResampleDialog(wx.Dialog):
                            title=title,
                            style=wx.DEFAULT_DIALOG_STYLE)
 
-        self.__oldShape  = tuple(shape)
-        self.__oldPixdim = tuple(pixdim)
+        self.__oldShape  = np.array(shape,  dtype=np.float64)
+        self.__oldPixdim = np.array(pixdim, dtype=np.float64)
+
+        labels, tips = _dialogStrings(type(self))
 
         self.__ok     = wx.Button(self, id=wx.ID_OK)
         self.__reset  = wx.Button(self)
         self.__cancel = wx.Button(self, id=wx.ID_CANCEL)
 
-        self.__ok    .SetLabel(strings.labels[self, 'ok'])
-        self.__reset .SetLabel(strings.labels[self, 'reset'])
-        self.__cancel.SetLabel(strings.labels[self, 'cancel'])
+        self.__ok    .SetLabel(labels['ok'])
+        self.__reset .SetLabel(labels['reset'])
+        self.__cancel.SetLabel(labels['cancel'])
 
         voxargs = {'minValue'  : 1,
                    'maxValue'  : 9999,
@@ -154,10 +1066,10 @@ class ResampleDialog(wx.Dialog):
         self.__voxLabel     = wx.StaticText(self)
         self.__pixLabel     = wx.StaticText(self)
 
-        self.__origVoxLabel.SetLabel(strings.labels[self, 'origVoxels'])
-        self.__origPixLabel.SetLabel(strings.labels[self, 'origPixdims'])
-        self.__voxLabel    .SetLabel(strings.labels[self, 'newVoxels'])
-        self.__pixLabel    .SetLabel(strings.labels[self, 'newPixdims'])
+        self.__origVoxLabel.SetLabel(labels['origVoxels'])
+        self.__origPixLabel.SetLabel(labels['origPixdims'])
+        self.__voxLabel    .SetLabel(labels['newVoxels'])
+        self.__pixLabel    .SetLabel(labels['newPixdims'])
 
         self.__origVoxx = wx.StaticText(self, label=strvox[0])
         self.__origVoxy = wx.StaticText(self, label=strvox[1])
@@ -173,17 +1085,11 @@ class ResampleDialog(wx.Dialog):
         self.__pixy = floatspin.FloatSpinCtrl(self, value=pixdim[1], **pixargs)
         self.__pixz = floatspin.FloatSpinCtrl(self, value=pixdim[2], **pixargs)
 
-        self.__interpChoices = ['linear', 'nearest', 'cubic']
-        self.__dtypeChoices  = [('float',  np.float32),
-                                ('uchar',  np.uint8),
-                                ('sshort', np.int16),
-                                ('sint',   np.int32),
-                                ('double', np.float64)]
+        self.__interpChoices = _INTERP_CHOICES
+        self.__dtypeChoices  = _DTYPE_CHOICES
 
-        self.__interpLabels  = [strings.labels[self, c]
-                                for c in self.__interpChoices]
-        self.__dtypeLabels   = [strings.labels[self, c[0]]
-                                for c in self.__dtypeChoices]
+        self.__interpLabels  = [labels[c[0]] for c in self.__interpChoices]
+        self.__dtypeLabels   = [labels[c[0]] for c in self.__dtypeChoices]
 
         self.__interpLabel = wx.StaticText(self)
         self.__dtypeLabel  = wx.StaticText(self)
@@ -191,81 +1097,63 @@ class ResampleDialog(wx.Dialog):
         self.__interp      = wx.Choice(self, choices=self.__interpLabels)
         self.__dtype       = wx.Choice(self, choices=self.__dtypeLabels)
         self.__smooth      = wx.CheckBox(self)
+        self.__allVolLabel = wx.StaticText(self)
+        self.__allVols     = wx.CheckBox(self)
 
         self.__interp.SetSelection(0)
         self.__dtype .SetSelection(0)
         self.__smooth.SetValue(True)
+        self.__allVols.SetValue(False)
 
-        self.__interpLabel.SetLabel(strings.labels[self, 'interpolation'])
-        self.__dtypeLabel .SetLabel(strings.labels[self, 'dtype'])
-        self.__smoothLabel.SetLabel(strings.labels[self, 'smoothing'])
+        self.__interpLabel.SetLabel(labels['interpolation'])
+        self.__dtypeLabel .SetLabel(labels['dtype'])
+        self.__smoothLabel.SetLabel(labels['smoothing'])
+        self.__allVolLabel.SetLabel(labels['allVolumes'])
 
         self.__interp     .SetToolTip(
-            wx.ToolTip(tooltips.misc[self, 'interpolation']))
+            wx.ToolTip(tips['interpolation']))
         self.__interpLabel.SetToolTip(
-            wx.ToolTip(tooltips.misc[self, 'interpolation']))
+            wx.ToolTip(tips['interpolation']))
         self.__dtype      .SetToolTip(
-            wx.ToolTip(tooltips.misc[self, 'dtype']))
+            wx.ToolTip(tips['dtype']))
         self.__dtypeLabel .SetToolTip(
-            wx.ToolTip(tooltips.misc[self, 'dtype']))
+            wx.ToolTip(tips['dtype']))
         self.__smooth     .SetToolTip(
-            wx.ToolTip(tooltips.misc[self, 'smoothing']))
+            wx.ToolTip(tips['smoothing']))
         self.__smoothLabel.SetToolTip(
-            wx.ToolTip(tooltips.misc[self, 'smoothing']))
+            wx.ToolTip(tips['smoothing']))
+        self.__allVols    .SetToolTip(
+            wx.ToolTip(tips['allVolumes']))
+        self.__allVolLabel.SetToolTip(
+            wx.ToolTip(tips['allVolumes']))
 
-        self.__labelSizer  = wx.BoxSizer(wx.HORIZONTAL)
-        self.__xrowSizer   = wx.BoxSizer(wx.HORIZONTAL)
-        self.__yrowSizer   = wx.BoxSizer(wx.HORIZONTAL)
-        self.__zrowSizer   = wx.BoxSizer(wx.HORIZONTAL)
+        self.__gridSizer   = wx.FlexGridSizer(4, 4, 0, 10)
         self.__interpSizer = wx.BoxSizer(wx.HORIZONTAL)
         self.__dtypeSizer  = wx.BoxSizer(wx.HORIZONTAL)
         self.__smoothSizer = wx.BoxSizer(wx.HORIZONTAL)
+        self.__allVolSizer = wx.BoxSizer(wx.HORIZONTAL)
         self.__btnSizer    = wx.BoxSizer(wx.HORIZONTAL)
         self.__mainSizer   = wx.BoxSizer(wx.VERTICAL)
 
-        self.__labelSizer.Add((10, 10),            flag=wx.EXPAND)
-        self.__labelSizer.Add(self.__origVoxLabel, flag=wx.EXPAND,
-                              proportion=1)
-        self.__labelSizer.Add((10, 10),            flag=wx.EXPAND)
-        self.__labelSizer.Add(self.__origPixLabel, flag=wx.EXPAND,
-                              proportion=1)
-        self.__labelSizer.Add((10, 10),            flag=wx.EXPAND)
-        self.__labelSizer.Add(self.__voxLabel,     flag=wx.EXPAND,
-                              proportion=1)
-        self.__labelSizer.Add((10, 10),            flag=wx.EXPAND)
-        self.__labelSizer.Add(self.__pixLabel,     flag=wx.EXPAND,
-                              proportion=1)
-        self.__labelSizer.Add((10, 10),            flag=wx.EXPAND)
-
-        self.__xrowSizer.Add((10, 10),        flag=wx.EXPAND)
-        self.__xrowSizer.Add(self.__origVoxx, flag=wx.EXPAND, proportion=1)
-        self.__xrowSizer.Add((10, 10),        flag=wx.EXPAND)
-        self.__xrowSizer.Add(self.__origPixx, flag=wx.EXPAND, proportion=1)
-        self.__xrowSizer.Add((10, 10),        flag=wx.EXPAND)
-        self.__xrowSizer.Add(self.__voxx,     flag=wx.EXPAND, proportion=1)
-        self.__xrowSizer.Add((10, 10),        flag=wx.EXPAND)
-        self.__xrowSizer.Add(self.__pixx,     flag=wx.EXPAND, proportion=1)
-        self.__xrowSizer.Add((10, 10),        flag=wx.EXPAND)
-
-        self.__yrowSizer.Add((10, 10),        flag=wx.EXPAND)
-        self.__yrowSizer.Add(self.__origVoxy, flag=wx.EXPAND, proportion=1)
-        self.__yrowSizer.Add((10, 10),        flag=wx.EXPAND)
-        self.__yrowSizer.Add(self.__origPixy, flag=wx.EXPAND, proportion=1)
-        self.__yrowSizer.Add((10, 10),        flag=wx.EXPAND)
-        self.__yrowSizer.Add(self.__voxy,     flag=wx.EXPAND, proportion=1)
-        self.__yrowSizer.Add((10, 10),        flag=wx.EXPAND)
-        self.__yrowSizer.Add(self.__pixy,     flag=wx.EXPAND, proportion=1)
-        self.__yrowSizer.Add((10, 10),        flag=wx.EXPAND)
-
-        self.__zrowSizer.Add((10, 10),        flag=wx.EXPAND)
-        self.__zrowSizer.Add(self.__origVoxz, flag=wx.EXPAND, proportion=1)
-        self.__zrowSizer.Add((10, 10),        flag=wx.EXPAND)
-        self.__zrowSizer.Add(self.__origPixz, flag=wx.EXPAND, proportion=1)
-        self.__zrowSizer.Add((10, 10),        flag=wx.EXPAND)
-        self.__zrowSizer.Add(self.__voxz,     flag=wx.EXPAND, proportion=1)
-        self.__zrowSizer.Add((10, 10),        flag=wx.EXPAND)
-        self.__zrowSizer.Add(self.__pixz,     flag=wx.EXPAND, proportion=1)
-        self.__zrowSizer.Add((10, 10),        flag=wx.EXPAND)
+        # The labels, and the x/y/z rows of
+        # shape/pixdim values, are laid out
+        # in a single 4x4 grid.
+        gridItems = [self.__origVoxLabel, self.__origPixLabel,
+                     self.__voxLabel,     self.__pixLabel,
+                     self.__origVoxx,     self.__origPixx,
+                     self.__voxx,         self.__pixx,
+                     self.__origVoxy,     self.__origPixy,
+                     self.__voxy,         self.__pixy,
+                     self.__origVoxz,     self.__origPixz,
+                     self.__voxz,         self.__pixz]
+
+        for i, item in enumerate(gridItems):
+            if i < 4: self.__gridSizer.Add(item, flag=wx.EXPAND | wx.BOTTOM,
+                                           border=10)
+            else:     self.__gridSizer.Add(item, flag=wx.EXPAND)
+
+        for col in range(4):
+            self.__gridSizer.AddGrowableCol(col, 1)
 
         self.__interpSizer.Add((50, 1),            flag=wx.EXPAND)
         self.__interpSizer.Add(self.__interpLabel, flag=wx.EXPAND)
@@ -288,6 +1176,13 @@ class ResampleDialog(wx.Dialog):
         self.__smoothSizer.Add((10, 1),            flag=wx.EXPAND,
                                proportion=1)
 
+        self.__allVolSizer.Add((50, 1),            flag=wx.EXPAND)
+        self.__allVolSizer.Add(self.__allVolLabel, flag=wx.EXPAND)
+        self.__allVolSizer.Add((10, 1),            flag=wx.EXPAND)
+        self.__allVolSizer.Add(self.__allVols,     flag=wx.EXPAND)
+        self.__allVolSizer.Add((10, 1),            flag=wx.EXPAND,
+                               proportion=1)
+
         self.__btnSizer.Add((10, 1),       flag=wx.EXPAND, proportion=1)
         self.__btnSizer.Add(self.__ok,     flag=wx.EXPAND)
         self.__btnSizer.Add((10, 1),       flag=wx.EXPAND)
@@ -297,11 +1192,9 @@ class ResampleDialog(wx.Dialog):
         self.__btnSizer.Add((10, 1),       flag=wx.EXPAND, proportion=1)
 
         self.__mainSizer.Add((10, 10),           flag=wx.EXPAND)
-        self.__mainSizer.Add(self.__labelSizer,  flag=wx.EXPAND)
-        self.__mainSizer.Add((10, 10),           flag=wx.EXPAND)
-        self.__mainSizer.Add(self.__xrowSizer,   flag=wx.EXPAND)
-        self.__mainSizer.Add(self.__yrowSizer,   flag=wx.EXPAND)
-        self.__mainSizer.Add(self.__zrowSizer,   flag=wx.EXPAND)
+        self.__mainSizer.Add(self.__gridSizer,
+                             flag=wx.EXPAND | wx.LEFT | wx.RIGHT,
+                             border=10)
         self.__mainSizer.Add((10, 10),           flag=wx.EXPAND)
         self.__mainSizer.Add(self.__interpSizer, flag=wx.EXPAND)
         self.__mainSizer.Add((10, 10),           flag=wx.EXPAND)
@@ -309,6 +1202,16 @@ class ResampleDialog(wx.Dialog):
         self.__mainSizer.Add((10, 10),           flag=wx.EXPAND)
         self.__mainSizer.Add(self.__smoothSizer, flag=wx.EXPAND)
         self.__mainSizer.Add((10, 10),           flag=wx.EXPAND)
+
+        # The all volumes option is
+        # only shown for 4D images
+        if len(shape) == 4:
+            self.__mainSizer.Add(self.__allVolSizer, flag=wx.EXPAND)
+            self.__mainSizer.Add((10, 10),           flag=wx.EXPAND)
+        else:
+            self.__allVolLabel.Hide()
+            self.__allVols    .Hide()
+
         self.__mainSizer.Add(self.__btnSizer,    flag=wx.EXPAND)
         self.__mainSizer.Add((10, 10),           flag=wx.EXPAND)
 
@@ -388,11 +1291,11 @@ class ResampleDialog(wx.Dialog):
 
 
     def GetInterpolation(self):
-        """Returns the currently selected interpolation setting, either
-        ``'nearest'``, ``'linear'``, or ``'cubic'``.
+        """Returns the currently selected interpolation setting, as a spline
+        order - ``0`` (nearest neighbour), ``1`` (linear), or ``3`` (cubic).
         """
         choice = self.__interp.GetSelection()
-        return self.__interpChoices[choice]
+        return self.__interpChoices[choice][1]
 
 
     def GetDataType(self):
@@ -411,6 +1314,14 @@ class ResampleDialog(wx.Dialog):
         return self.__smooth.GetValue()
 
 
+    def GetAllVolumes(self):
+        """Returns the currently selected all volumes setting, either
+        ``True``, or ``False``. This is always ``False`` for images which
+        are not 4D.
+        """
+        return len(self.__oldShape) == 4 and self.__allVols.GetValue()
+
+
     def GetPixdims(self):
         """Returns the current pixdim values. """
         return (self.__pixx.GetValue(),
@@ -420,21 +1331,17 @@ class ResampleDialog(wx.Dialog):
 
     def __derivePixdims(self):
         """Derives new pixdim values from the current voxel values. """
-        olds = self.__oldShape
-        oldp = self.__oldPixdim
-        news = self.GetVoxels()
-        fac  = [o / float(n) for o, n in zip(olds, news)]
-        newp = [p * f        for p, f in zip(oldp, fac)]
+        olds = self.__oldShape[ :3]
+        oldp = self.__oldPixdim[:3]
+        news = np.array(self.GetVoxels(), dtype=np.float64)
 
-        return newp
+        return oldp * olds / news
 
 
     def __deriveVoxels(self):
         """Derives new voxel values from the current pixdim values. """
-        olds = self.__oldShape
-        oldp = self.__oldPixdim
-        newp = self.GetPixdims()
-        fac  = [o / float(n) for o, n in zip(oldp, newp)]
-        news = [p * f        for p, f in zip(olds, fac)]
+        olds = self.__oldShape[ :3]
+        oldp = self.__oldPixdim[:3]
+        newp = np.array(self.GetPixdims(), dtype=np.float64)
 
-        return news
+        return olds * oldp / newp
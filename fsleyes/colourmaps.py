@@ -139,7 +139,9 @@ This list of label, colour, and name mappings is used to create a
 :class:`LookupTable` instance, which can be used to access the colours and
 names associated with each label value.
 
-.. note:: The labels specified in a ``.lut`` file must be in ascending order.
+.. note:: The labels specified in a ``.lut`` file should be in ascending
+          order. Files which are not will be sorted when they are loaded,
+          but label values must be unique.
 
 
 Once created, ``LookupTable`` instances may be modified - labels can be
@@ -201,29 +203,40 @@ colours:
 """
 
 
-import os.path as op
-import            os
-import            glob
-import            bisect
-import            string
-import            logging
-import            colorsys
+import os.path              as op
+import multiprocessing.pool as mppool
+import                         os
+import                         sys
+import                         bisect
+import                         string
+import                         logging
 
 from collections import OrderedDict
 
-import          six
-import numpy as np
+import                      six
+import numpy             as np
+import matplotlib.cm     as mplcm
+import matplotlib.colors as mplcolors
 
-import fsleyes_props      as props
-import                       fsleyes
-import fsl.utils.settings as fslsettings
-import fsl.utils.notifier as notifier
-import fsl.data.vest      as vest
+import fsleyes_props         as props
+import                          fsleyes
+import fsl.utils.settings    as fslsettings
+import fsl.utils.notifier    as notifier
+import fsl.utils.weakfuncref as weakfuncref
+import fsl.data.vest         as vest
 
 
 log = logging.getLogger(__name__)
 
 
+if sys.version_info >= (3, 7): _OrderedDict = dict
+else:                          _OrderedDict = OrderedDict
+"""Type used for the colour map and lookup table registers. Plain ``dict``
+objects preserve insertion order from Python 3.7 onwards, and are cheaper
+to create, populate and iterate over than ``OrderedDict`` objects.
+"""
+
+
 def getCmapDir():
     """Returns the directory in which all built-in colour map files are stored.
     """
@@ -236,44 +249,69 @@ def getLutDir():
     return op.join(fsleyes.assetDir, 'assets', 'luts')
 
 
-def scanBuiltInCmaps():
-    """Returns a list of IDs for all built-in colour maps. """
+_scanCache = {}
+"""Used by :func:`_scanDir`. Contains ``{(dirname, suffix) : (mtime, ids)}``
+mappings, storing the result of the last scan of each colour map/lookup
+table directory.
+"""
 
-    cmapIDs  = glob.glob(op.join(getCmapDir(), '*.cmap'))
-    cmapIDs  = [op.splitext(op.basename(f))[0] for f in cmapIDs]
 
-    return cmapIDs
+def _scanDir(dirname, suffix):
+    """Used by the ``scan*`` functions. Returns the prefixes of all
+    (non-hidden) files in ``dirname`` which end with ``suffix``. The
+    directory is listed once, and the file names are filtered and sliced
+    directly.
 
+    The result is cached, and the directory is only listed again when its
+    modification time changes (i.e. when a file is added to, or removed
+    from, it).
+    """
 
-def scanBuiltInLuts():
-    """Returns a list of IDs for all built-in lookup tables. """
+    try:
+        mtime = os.stat(dirname).st_mtime
+    except OSError:
+        return []
 
-    lutIDs = glob.glob(op.join(getLutDir(), '*.lut'))
-    lutIDs = [op.splitext(op.basename(f))[0] for f in lutIDs]
+    key    = (dirname, suffix)
+    cached = _scanCache.get(key)
 
-    return lutIDs
+    if cached is not None and cached[0] == mtime:
+        return list(cached[1])
 
+    try:
+        names = os.listdir(dirname)
+    except OSError:
+        return []
 
-def scanUserAddedCmaps():
-    """Returns a list of IDs for all user-added colour maps. """
+    slen = len(suffix)
+    ids  = [n[:-slen] for n in names
+            if n.endswith(suffix) and not n.startswith('.')]
 
-    cmapFiles = fslsettings.listFiles('colourmaps/*.cmap')
-    cmapFiles = [op.basename(f)    for f in cmapFiles]
-    cmapIDs   = [op.splitext(f)[0] for f in cmapFiles]
-    cmapIDs   = [m.lower()         for m in cmapIDs]
+    _scanCache[key] = (mtime, ids)
 
-    return cmapIDs
+    return list(ids)
 
 
-def scanUserAddedLuts():
-    """Returns a list of IDs for all user-added lookup tables. """
+def scanBuiltInCmaps():
+    """Returns a list of IDs for all built-in colour maps. """
+    return _scanDir(getCmapDir(), '.cmap')
 
-    lutFiles = fslsettings.listFiles('luts/*.lut')
-    lutFiles = [op.basename(f)    for f in lutFiles]
-    lutIDs   = [op.splitext(f)[0] for f in lutFiles]
-    lutIDs   = [m.lower()         for m in lutIDs]
 
-    return lutIDs
+def scanBuiltInLuts():
+    """Returns a list of IDs for all built-in lookup tables. """
+    return _scanDir(getLutDir(), '.lut')
+
+
+def scanUserAddedCmaps():
+    """Returns a list of IDs for all user-added colour maps. """
+    cmapDir = fslsettings.filePath('colourmaps')
+    return [m.lower() for m in _scanDir(cmapDir, '.cmap')]
+
+
+def scanUserAddedLuts():
+    """Returns a list of IDs for all user-added lookup tables. """
+    lutDir = fslsettings.filePath('luts')
+    return [m.lower() for m in _scanDir(lutDir, '.lut')]
 
 
 def makeValidMapKey(name):
@@ -298,6 +336,21 @@ def isValidMapKey(key):
     return all([c in valid for c in key])
 
 
+def _fileMapKey(filename):
+    """Used by :func:`registerColourMap` and :func:`registerLookupTable`.
+    Returns a valid colour map/lookup table key derived from the given file
+    name, with its directory and final suffix (e.g. ``.cmap``) removed.
+    """
+
+    base = op.basename(filename)
+    dot  = base.rfind('.')
+
+    if dot > 0:
+        base = base[:dot]
+
+    return makeValidMapKey(base)
+
+
 def scanColourMaps():
     """Scans the colour maps directories, and returns a list containing the
     names of all colour maps contained within. This function may be called
@@ -315,14 +368,26 @@ def scanLookupTables():
 
 
 _cmaps = None
-"""An ``OrderedDict`` which contains all registered colour maps as
-``{key : _Map}`` mappings.
+"""An ordered dictionary (see :data:`_OrderedDict`) which contains all
+registered colour maps as ``{key : _Map}`` mappings.
 """
 
 
 _luts = None
-"""An ``OrderedDict`` which contains all registered lookup tables as
-``{key : _Map}`` mappings.
+"""An ordered dictionary (see :data:`_OrderedDict`) which contains all
+registered lookup tables as ``{key : _Map}`` mappings.
+"""
+
+
+_cmapsLower = None
+"""A dictionary containing ``{key.lower() : key}`` mappings for all
+registered colour maps. Used by :func:`_caseInsensitiveLookup`.
+"""
+
+
+_lutsLower = None
+"""A dictionary containing ``{key.lower() : key}`` mappings for all
+registered lookup tables. Used by :func:`_caseInsensitiveLookup`.
 """
 
 
@@ -339,39 +404,48 @@ def init(force=False):
 
     global _cmaps
     global _luts
+    global _cmapsLower
+    global _lutsLower
 
     # Already initialised
     if not force and (_cmaps is not None) and (_luts is not None):
         return
 
-    _cmaps = OrderedDict()
-    _luts  = OrderedDict()
+    _cmaps      = _OrderedDict()
+    _luts       = _OrderedDict()
+    _cmapsLower = {}
+    _lutsLower  = {}
 
     # Reads the order.txt file from the built-in
     # /colourmaps/ or /luts/ directory. This file
     # contains display names and defines the order
     # in which built-in maps should be displayed.
     def readOrderTxt(filename):
-        maps = OrderedDict()
+        maps = _OrderedDict()
 
         if not op.exists(filename):
             return maps
 
         with open(filename, 'rt') as f:
-            lines = f.read().split('\n')
-
-            for line in lines:
-                if line.strip() == '':
-                    continue
-
-                # The order.txt file is assumed to
-                # contain one row per cmap/lut,
-                # where the first word is the key
-                # (the cmap/lut file name prefix),
-                # and the remainder of the line is
-                # the cmap/lut name
-                key, name         = line.split(' ', 1)
-                maps[key.strip()] = name.strip()
+            lines = f.read().splitlines()
+
+        for line in lines:
+
+            line = line.strip()
+
+            if line == '':
+                continue
+
+            # The order.txt file is assumed to
+            # contain one row per cmap/lut,
+            # where the first word is the key
+            # (the cmap/lut file name prefix),
+            # and the remainder of the line is
+            # the cmap/lut name. If there is
+            # no name, the key is used.
+            key, _, name = line.partition(' ')
+            maps[key]    = name.strip() or key
+
         return maps
 
     # Reads any display names that have been
@@ -382,9 +456,10 @@ def init(force=False):
         elif mapType == 'lut':  key = 'fsleyes.luts'
         return fslsettings.read(key, OrderedDict())
 
-    # Get all colour map/lut IDs and
-    # paths to the cmap/lut files. We
-    # process cmaps/luts in the same
+    # Get all colour map/lut IDs, and
+    # the directories which contain the
+    # cmap/lut files. We process
+    # cmaps/luts in the same
     # way, so we loop over all of
     # these lists, doing colour maps
     # first, then luts second.
@@ -398,15 +473,17 @@ def init(force=False):
     for mapType, builtinDir, userDir, builtinIDs, userIDs, register in zip(
             mapTypes, builtinDirs, userDirs, allBuiltins, allUsers, registers):
 
-        builtinFiles = ['{}.{}'.format(m, mapType) for m in builtinIDs]
-        builtinFiles = [op.join(builtinDir, m)     for m in builtinFiles]
-        userFiles    = ['{}.{}'.format(m, mapType) for m in userIDs]
-        userFiles    = [op.join(userDir, m)        for m in userFiles]
-        userFiles    = [fslsettings.filePath(m)    for m in userFiles]
-
-        allIDs   = builtinIDs   + userIDs
-        allFiles = builtinFiles + userFiles
-        allFiles = {mid : mfile for mid, mfile in zip(allIDs, allFiles)}
+        # The directories have already been
+        # listed by the scan functions, so
+        # we just record which directory
+        # each map lives in (user-added maps
+        # overriding built-in ones), and
+        # only create file paths for the
+        # maps which are registered below.
+        userDir = fslsettings.filePath(userDir)
+        allIDs  = builtinIDs + userIDs
+        mapDirs = {mid : builtinDir for mid in builtinIDs}
+        mapDirs.update({mid : userDir for mid in userIDs})
 
         # Read order/display names from order.txt
         # (for builtins), and from fslsettings
@@ -427,18 +504,33 @@ def init(force=False):
             if mid not in names:
                 names[mid] = mid
 
-        # Now register all of those maps,
-        # in the order defined by order.txt
+        # The user-added {id:name} dict
+        # might contain obsolete/invalid
+        # names, so we ignore any maps
+        # which do not have a file
+        toRegister = []
         for mapID, mapName in names.items():
 
-            # The user-added {id:name} dict
-            # might contain obsolete/invalid
-            # names, so we ignore keyerrors
-            try:
-                mapFile = allFiles[mapID]
-            except KeyError:
+            mapDir = mapDirs.get(mapID, None)
+
+            if mapDir is None:
                 continue
 
+            mapFile = op.join(mapDir, mapID + '.' + mapType)
+            toRegister.append((mapID, mapName, mapFile))
+
+        # Colour map files are loaded in one
+        # batch before any of them are registered,
+        # so that registration (which patches the
+        # DisplayOpts classes) is not interleaved
+        # with file I/O. Lookup table files are
+        # lazily loaded, so are left alone.
+        if mapType == 'cmap':
+            _loadColourMapFiles([mapFile for _, _, mapFile in toRegister])
+
+        # Now register all of those maps,
+        # in the order defined by order.txt
+        for mapID, mapName, mapFile in toRegister:
             try:
                 kwargs = {'key' : mapID, 'name' : mapName}
 
@@ -454,6 +546,162 @@ def init(force=False):
                          exc_info=True)
 
 
+_cmapFileCache = {}
+"""Cache used by :func:`_loadColourMapFile`, containing
+``{cmapFile : (mtime, data)}`` mappings.
+"""
+
+
+def _loadColourMapFile(cmapFile, mtime):
+    """Used by :func:`registerColourMap`. Loads RGB data from the given
+    colour map file, which may be a plain text file, or a FSLView style VEST
+    LUT file.
+
+    The result is cached in :data:`_cmapFileCache`, so the same file is not
+    parsed again if it is re-registered (e.g. when :func:`init` is called
+    with ``force=True``). Only one entry is stored for each file - if the
+    file modification time has changed, the file is re-loaded, and the
+    entry is replaced.
+
+    :arg cmapFile: Name of a file containing RGB values
+    :arg mtime:    Modification time of ``cmapFile``
+    :returns:      A ``numpy`` array of shape ``(n, 3)`` containing the
+                   RGB values.
+    """
+
+    cached = _cmapFileCache.get(cmapFile, None)
+
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    data = _parseColourMapFile(cmapFile)
+
+    _cmapFileCache[cmapFile] = (mtime, data)
+
+    return data
+
+
+def _parseColourMapFile(cmapFile):
+    """Used by :func:`_loadColourMapFile`. Loads and returns the RGB data
+    from the given colour map file.
+    """
+
+    # The file could be a FSLView style VEST-LUT
+    if vest.looksLikeVestLutFile(cmapFile):
+        return vest.loadVestLutFile(cmapFile, normalise=False)
+
+    # Or just a plain 2D text array. np.loadtxt
+    # is very slow, so we read the file in one
+    # go, and let numpy parse all of it at once.
+    # np.fromstring stops (without raising an
+    # error) at the first value it cannot parse,
+    # so we check that every token was parsed.
+    with open(cmapFile, 'rt') as f:
+        text = f.read()
+
+    ncols   = len(text.lstrip().split('\n', 1)[0].split())
+    ntokens = len(text.split())
+    data    = np.fromstring(text, sep=' ')
+
+    if ncols == 0 or data.size != ntokens or data.size % ncols != 0:
+        raise ValueError('{} does not look like a colour '
+                         'map file'.format(cmapFile))
+
+    return data.reshape(-1, ncols)
+
+
+def _loadColourMapFiles(cmapFiles):
+    """Used by :func:`init`. Loads the data from all of the given colour map
+    files via :func:`_loadColourMapFile`, so that it is cached and ready to
+    be used when each colour map is registered by :func:`registerColourMap`.
+    Any errors are ignored here - they will occur again, and be reported,
+    when the offending colour map is registered.
+
+    The files are loaded concurrently on a small pool of threads, as most
+    of the time is spent waiting for file I/O.
+    """
+
+    def load(cmapFile):
+        try:
+            _loadColourMapFile(cmapFile, op.getmtime(cmapFile))
+        except Exception:
+            pass
+
+    nthreads = min(len(cmapFiles), 8)
+
+    if nthreads <= 1:
+        for cmapFile in cmapFiles:
+            load(cmapFile)
+        return
+
+    pool = mppool.ThreadPool(nthreads)
+
+    try:
+        pool.map(load, cmapFiles)
+    finally:
+        pool.close()
+        pool.join()
+
+
+_cmapProps = None
+"""Used by :func:`registerColourMap`. A tuple of ``(class, propName)``
+pairs, for all :class:`.DisplayOpts` colour map properties. Created on the
+first call to :func:`_getCmapProps`.
+"""
+
+
+_lutProps = None
+"""Used by :func:`registerLookupTable`. A tuple of ``(class, propName)``
+pairs, for all :class:`.DisplayOpts` lookup table properties. Created on
+the first call to :func:`_getLutProps`.
+"""
+
+
+def _getCmapProps():
+    """Returns the :data:`_cmapProps` tuple, creating it if necessary. """
+
+    global _cmapProps
+
+    if _cmapProps is not None:
+        return _cmapProps
+
+    # fsleyes.displaycontext imports
+    # this module, so we can only
+    # import it once it is needed.
+    import fsleyes.displaycontext as fsldisplay
+
+    # A list of all DisplayOpts colour map properties.
+    # n.b. We can't simply list the ColourMapOpts class
+    # here, because it is a mixin, and does not actually
+    # derive from props.HasProperties.
+    #
+    # TODO Any new DisplayOpts sub-types which have a
+    #      colour map will need to be patched here
+    _cmapProps = ((fsldisplay.VolumeOpts, 'cmap'),
+                  (fsldisplay.VolumeOpts, 'negativeCmap'),
+                  (fsldisplay.VectorOpts, 'cmap'),
+                  (fsldisplay.MeshOpts,   'cmap'),
+                  (fsldisplay.MeshOpts,   'negativeCmap'))
+
+    return _cmapProps
+
+
+def _getLutProps():
+    """Returns the :data:`_lutProps` tuple, creating it if necessary. """
+
+    global _lutProps
+
+    if _lutProps is not None:
+        return _lutProps
+
+    import fsleyes.displaycontext as fsldisplay
+
+    _lutProps = ((fsldisplay.LabelOpts, 'lut'),
+                 (fsldisplay.MeshOpts,  'lut'))
+
+    return _lutProps
+
+
 def registerColourMap(cmapFile,
                       overlayList=None,
                       displayCtx=None,
@@ -483,54 +731,34 @@ def registerColourMap(cmapFile,
                       to the ``name``.
     """
 
-    import matplotlib.cm     as mplcm
-    import matplotlib.colors as colors
-
     if key is not None and not isValidMapKey(key):
         raise ValueError('{} is not a valid colour map identifier'.format(key))
 
     if key is None:
-        key = op.basename(cmapFile).split('.')[0]
-        key = makeValidMapKey(key)
+        key = _fileMapKey(cmapFile)
 
     if name        is None: name        = key
     if overlayList is None: overlayList = []
 
-    # The file could be a FSLView style VEST-LUT
-    if vest.looksLikeVestLutFile(cmapFile):
-        data = vest.loadVestLutFile(cmapFile, normalise=False)
-
-    # Or just a plain 2D text array
-    else:
-        data = np.loadtxt(cmapFile)
+    # The loaded data is cached, so we take
+    # a copy in case it is modified later on
+    data = _loadColourMapFile(cmapFile, op.getmtime(cmapFile))
+    data = np.array(data)
 
-    cmap = colors.ListedColormap(data, key)
+    cmap = mplcolors.ListedColormap(data, key)
 
     log.debug('Loading and registering custom '
               'colour map: {}'.format(cmapFile))
 
     mplcm.register_cmap(key, cmap)
 
-    _cmaps[key] = _Map(key, name, cmap, None, False)
+    _cmaps[key]              = _Map(key, name, cmap, None, False)
+    _cmapsLower[key.lower()] = key
 
     log.debug('Patching DisplayOpts instances and class '
               'to support new colour map {}'.format(key))
 
-    import fsleyes.displaycontext as fsldisplay
-
-    # A list of all DisplayOpts colour map properties.
-    # n.b. We can't simply list the ColourMapOpts class
-    # here, because it is a mixin, and does not actually
-    # derive from props.HasProperties.
-    #
-    # TODO Any new DisplayOpts sub-types which have a
-    #      colour map will need to be patched here
-    cmapProps = []
-    cmapProps.append((fsldisplay.VolumeOpts, 'cmap'))
-    cmapProps.append((fsldisplay.VolumeOpts, 'negativeCmap'))
-    cmapProps.append((fsldisplay.VectorOpts, 'cmap'))
-    cmapProps.append((fsldisplay.MeshOpts,   'cmap'))
-    cmapProps.append((fsldisplay.MeshOpts,   'negativeCmap'))
+    cmapProps = _getCmapProps()
 
     # Update the colour map properties
     # for any existing instances
@@ -589,8 +817,7 @@ def registerLookupTable(lut,
     if lutFile is not None:
 
         if key is None:
-            key = op.basename(lutFile).split('.')[0]
-            key = makeValidMapKey(key)
+            key = _fileMapKey(lutFile)
 
         if name is None:
             name = key
@@ -611,20 +838,16 @@ def registerLookupTable(lut,
     # a file, it has not necessarily been installed
     lut.saved = False
 
-    _luts[key] = _Map(key, name, lut, None, False)
+    _luts[key]              = _Map(key, name, lut, None, False)
+    _lutsLower[key.lower()] = key
 
     log.debug('Patching LabelOpts classes to support '
               'new LookupTable {}'.format(key))
 
-    import fsleyes.displaycontext as fsldisplay
-
-    # See similar situation in the registerColourMap
-    # function above. All DisplayOpts classes which
-    # have a lut property (assumed to be a props.Choice)
+    # All DisplayOpts classes which have a
+    # lut property (assumed to be a props.Choice)
     # must have the new LUT added as an option.
-    lutProps = []
-    lutProps.append((fsldisplay.LabelOpts, 'lut'))
-    lutProps.append((fsldisplay.MeshOpts,  'lut'))
+    lutProps = _getLutProps()
 
     # Update the lut property for
     # any existing label overlays
@@ -653,7 +876,7 @@ def getLookupTables():
 
 def getLookupTable(key):
     """Returns the :class:`LookupTable` instance of the specified key/ID."""
-    return _caseInsensitiveLookup(_luts, key).mapObj
+    return _caseInsensitiveLookup(_luts, _lutsLower, key).mapObj
 
 
 def getColourMaps():
@@ -663,12 +886,12 @@ def getColourMaps():
 
 def getColourMap(key):
     """Returns the colour map instance of the specified key."""
-    return _caseInsensitiveLookup(_cmaps, key).mapObj
+    return _caseInsensitiveLookup(_cmaps, _cmapsLower, key).mapObj
 
 
 def getColourMapLabel(key):
     """Returns a label/display name for the specified colour map. """
-    return _caseInsensitiveLookup(_cmaps, key).name
+    return _caseInsensitiveLookup(_cmaps, _cmapsLower, key).name
 
 
 def isColourMapRegistered(key):
@@ -715,14 +938,21 @@ def installColourMap(key):
     #      this.
     data = cmap.mapObj.colors
 
-    destFile = op.join('colourmaps', '{}.cmap'.format(key))
+    destFile = op.join('colourmaps', key + '.cmap')
 
     log.debug('Installing colour map {} to {}'.format(key, destFile))
 
-    # Numpy under python 3 will break if
-    # we give it a file opened with mode='wt'.
+    # The whole file is formatted with a single
+    # string operation, and written in one go,
+    # rather than row-by-row via np.savetxt.
+    # The output is the same as that of
+    # np.savetxt(f, data, '%0.6f').
+    data   = np.asarray(data, dtype=np.float64)
+    rowfmt = ' '.join(['%0.6f'] * data.shape[1]) + '\n'
+    text   = (rowfmt * data.shape[0]) % tuple(data.ravel())
+
     with fslsettings.writeFile(destFile, mode='b') as f:
-        np.savetxt(f, data, '%0.6f')
+        f.write(text.encode('ascii'))
 
     # Update user-added settings
     cmapNames      = fslsettings.read('fsleyes.colourmaps', OrderedDict())
@@ -740,7 +970,7 @@ def installLookupTable(key):
 
     # keyerror if not registered
     lut      = _luts[key]
-    destFile = op.join('luts', '{}.lut'.format(key))
+    destFile = op.join('luts', key + '.lut')
     destFile = fslsettings.filePath(destFile)
     destDir  = op.dirname(destFile)
 
@@ -885,17 +1115,21 @@ def applyBricon(rgb, brightness, contrast):
     rgb       = np.array(rgb)
     oneColour = len(rgb.shape) == 1
     rgb       = rgb.reshape(-1, rgb.shape[-1])
+    colours   = rgb[:, :3]
 
     scale, offset = _briconToScaleOffset(brightness, contrast, 1)
 
     # The contrast factor scales the existing colour
     # range, but keeps the new range centred at 0.5.
-    rgb[:, :3] += offset
-
-    rgb[:, :3]  = np.clip(rgb[:, :3], 0.0, 1.0)
-    rgb[:, :3]  = (rgb[:, :3] - 0.5) * scale + 0.5
-
-    rgb[:, :3]  = np.clip(rgb[:, :3], 0.0, 1.0)
+    # The colours are a view into our copy of the
+    # input, so we can modify them in place, and
+    # avoid creating any temporary arrays.
+    colours += offset
+    np.clip(colours, 0.0, 1.0, out=colours)
+    colours -= 0.5
+    colours *= scale
+    colours += 0.5
+    np.clip(colours, 0.0, 1.0, out=colours)
 
     if oneColour: return rgb[0]
     else:         return rgb
@@ -903,8 +1137,7 @@ def applyBricon(rgb, brightness, contrast):
 
 def randomColour():
     """Generates a random RGB colour. """
-    values = [randomColour.random.rand() for i in range(3)]
-    return np.array(values)
+    return randomColour.random.rand(3)
 
 
 # The randomColour function uses a generator
@@ -935,16 +1168,19 @@ def complementaryColour(rgb):
 
     If the given ``rgb`` sequence contains four values, the fourth
     value (e.g. alpha) is returned unchanged.
+
+    The calculation is performed with ``numpy`` (see :func:`_rgbToHls` and
+    :func:`_hlsToRgb`), so ``rgb`` may also be a ``numpy`` array of shape
+    ``(n, 3)`` or ``(n, 4)`` containing ``n`` colours, in which case a
+    ``numpy`` array of the same shape is returned. Otherwise, a list is
+    returned.
     """
 
-    if len(rgb) >= 4:
-        a   = list(rgb[3:])
-        rgb = list(rgb[:3])
-    else:
-        a   = []
-        rgb = list(rgb)
+    colours   = np.array(rgb, dtype=np.float64)
+    oneColour = colours.ndim == 1
+    colours   = colours.reshape(-1, colours.shape[-1])
 
-    h, l, s = colorsys.rgb_to_hls(*rgb)
+    h, l, s = _rgbToHls(colours[:, :3])
 
     # My ad-hoc complementary colour calculation:
     # create a new colour with the opposite hue
@@ -957,21 +1193,94 @@ def complementaryColour(rgb):
     # (according to some arbitrary threshold),
     # force the new one to have a different
     # lightness
-    if abs(nl - l) < 0.3:
-        if l > 0.5: nl = 0.0
-        else:       nl = 1.0
+    similar     = np.abs(nl - l) < 0.3
+    nl[similar] = np.where(l[similar] > 0.5, 0.0, 1.0)
+
+    colours[:, :3] = _hlsToRgb(nh, nl, ns)
+
+    if oneColour: return list(colours[0])
+    else:         return colours
+
+
+def _rgbToHls(rgb):
+    """Used by :func:`complementaryColour`. Converts the given ``(n, 3)``
+    array of RGB colours into hue, lightness, and saturation, using the same
+    formulae as the :func:`colorsys.rgb_to_hls` function.
+
+    :returns: A tuple containing ``(n, )`` arrays of hue, lightness, and
+              saturation values.
+    """
+
+    r, g, b = rgb.T
+    maxc    = rgb.max(axis=1)
+    minc    = rgb.min(axis=1)
+    sumc    = maxc + minc
+    rangec  = maxc - minc
+    grey    = rangec == 0
+    light   = sumc / 2.0
+
+    # Avoid division by zero for grey
+    # colours, which have no hue or
+    # saturation
+    rangec = np.where(grey, 1, rangec)
+    denom  = np.where(light <= 0.5, sumc, 2.0 - maxc - minc)
+    denom  = np.where(grey, 1, denom)
+    s      = np.where(grey, 0, rangec / denom)
+
+    rc = (maxc - r) / rangec
+    gc = (maxc - g) / rangec
+    bc = (maxc - b) / rangec
+    h  = np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc)
+    h  = np.where(r == maxc, bc - gc, h)
+    h  = np.where(grey, 0, (h / 6.0) % 1.0)
+
+    return h, light, s
+
+
+def _hlsToRgb(h, light, s):
+    """Used by :func:`complementaryColour`. Converts the given hue,
+    lightness, and saturation arrays into RGB colours, using the same
+    formulae as the :func:`colorsys.hls_to_rgb` function.
+
+    :returns: A ``(n, 3)`` array of RGB colours.
+    """
 
-    nr, ng, nb = colorsys.hls_to_rgb(nh, nl, ns)
+    m2 = np.where(light <= 0.5, light * (1.0 + s), light + s - light * s)
+    m1 = 2.0 * light - m2
 
-    return [nr, ng, nb] + a
+    # The conditions are applied in reverse
+    # order, so that the first matching
+    # condition takes precedence
+    def channel(hue):
+        hue = hue % 1.0
+        val = np.where(hue < 2 / 3.0, m1 + (m2 - m1) * (2 / 3.0 - hue) * 6.0,
+                       m1)
+        val = np.where(hue < 0.5,     m2,                           val)
+        val = np.where(hue < 1 / 6.0, m1 + (m2 - m1) * hue * 6.0,   val)
+        return val
 
+    rgb = np.vstack((channel(h + 1 / 3.0), channel(h), channel(h - 1 / 3.0))).T
 
-def _caseInsensitiveLookup(d, k, default=None):
+    # Grey colours
+    grey      = s == 0
+    rgb[grey] = light[grey, np.newaxis]
+
+    return rgb
+
+
+def _caseInsensitiveLookup(d, lower, k, default=None):
     """Performs a case-insensitive lookup on the dictionary ``d``,
     with the key ``k``.
 
     This function is used to allow case-insensitive retrieval of colour maps
     and lookup tables.
+
+    :arg d:       Dictionary to look up
+    :arg lower:   Dictionary containing ``{key.lower() : key}`` mappings for
+                  every key in ``d`` (e.g. :data:`_cmapsLower`).
+    :arg k:       Key to look up
+    :arg default: Value to return if ``k`` is not in ``d``. If ``None``, a
+                  :exc:`KeyError` is raised.
     """
 
     v = d.get(k, None)
@@ -979,16 +1288,13 @@ def _caseInsensitiveLookup(d, k, default=None):
     if v is not None:
         return v
 
-    keys  = list(d.keys())
-    lKeys = [k.lower() for k in keys]
+    realKey = lower.get(k.lower(), None)
 
-    try:
-        idx = lKeys.index(k.lower())
-    except:
-        if default is not None: return default
-        else:                   raise  KeyError(k)
+    if realKey is not None:
+        return d[realKey]
 
-    return d[keys[idx]]
+    if default is not None: return default
+    else:                   raise  KeyError(k)
 
 
 class _Map(object):
@@ -997,6 +1303,12 @@ class _Map(object):
     """
 
 
+    __slots__ = ('key', 'name', 'mapObj', 'mapFile', 'installed')
+    """``_Map`` instances only hold a few fixed attributes, so they are
+    stored in slots rather than in an instance dictionary.
+    """
+
+
     def __init__(self, key, name, mapObj, mapFile, installed):
         """Create a ``_Map``.
 
@@ -1087,10 +1399,31 @@ class LutLabel(props.HasProperties):
         if enabled is None:
             enabled = LutLabel.getProp('enabled').getAttribute(None, 'default')
 
-        self.__value = value
-        self.name    = name
-        self.colour  = colour
-        self.enabled = enabled
+        self.__value        = value
+        self.__hash         = None
+        self.name           = name
+        self.colour         = colour
+        self.enabled        = enabled
+        self.__internalName = self.__lowerName()
+        self.__owner        = None
+
+        # The hash is calculated on first
+        # use, and cleared whenever any of
+        # the values that it depends upon
+        # change. The internal name is
+        # re-calculated whenever the name
+        # changes. Changes are then passed
+        # on to the owning LookupTable (see
+        # _setOwner).
+        #
+        # Rather than registering listeners on
+        # every label, the pre-notify function
+        # that every PropertyValue already has
+        # is set to a single function which is
+        # shared by all LutLabel instances.
+        for propName in ('name', 'colour', 'enabled'):
+            self.getPropVal(propName).setPreNotifyFunction(
+                LutLabel.__propChanged)
 
 
     @property
@@ -1104,33 +1437,95 @@ class LutLabel(props.HasProperties):
         """Returns the *internal* name of this ``LutLabel``, which is just
         its :attr:`name`, converted to lower-case. This is used by
         :meth:`__eq__` and :meth:`__hash__`, and by the
-        :class:`LookupTable` class.
+        :class:`LookupTable` class. It is calculated once, and is
+        re-calculated whenever the :attr:`name` changes.
         """
-        return self.name.lower()
+        return self.__internalName
+
+
+    def __lowerName(self):
+        """Returns the :attr:`name`, converted to lower-case, or an empty
+        string if the name is not set.
+        """
+        name = self.name
+        if name: return name.lower()
+        else:    return ''
 
 
     def __eq__(self, other):
         """Equality operator - returns ``True`` if this ``LutLabel``
-        has the same  value as the given one.
+        has the same  value as the given one. The ``other`` value may
+        be another ``LutLabel``, or an integer label value.
         """
-
-        return self.value == other.value
+        if isinstance(other, LutLabel):
+            other = other.value
+        return self.value == other
 
 
     def __lt__(self, other):
         """Less-than operator - compares two ``LutLabel`` instances
-        based on their value.
+        based on their value. The ``other`` value may be another
+        ``LutLabel``, or an integer label value.
         """
-        return self.value < other.value
+        if isinstance(other, LutLabel):
+            other = other.value
+        return self.value < other
 
 
     def __hash__(self):
         """The hash of a ``LutLabel`` is a combination of its
-        value, name, and colour, but not its enabled state.
+        value, name, and colour, but not its enabled state. The hash is
+        cached, and is re-calculated after the :attr:`name` or
+        :attr:`colour` changes.
         """
-        return (hash(self.value)        ^
-                hash(self.internalName) ^
-                hash(self.colour))
+
+        h = self.__hash
+
+        if h is None:
+            h = (hash(self.value)        ^
+                 hash(self.internalName) ^
+                 hash(self.colour))
+            self.__hash = h
+
+        return h
+
+
+    def _setOwner(self, owner):
+        """Used by :class:`LookupTable` instances. Sets a function which
+        is called whenever the :attr:`name`, :attr:`colour`, or
+        :attr:`enabled` properties of this ``LutLabel`` change.
+
+        :arg owner: A :class:`.WeakFunctionRef` encapsulating a listener
+                    function, which will be passed the same arguments as
+                    a property listener. May be ``None`` to clear the
+                    owner.
+        """
+        self.__owner = owner
+
+
+    @staticmethod
+    def __propChanged(value, valid, label, propName):
+        """Called when the :attr:`name`, :attr:`colour`, or
+        :attr:`enabled` properties of any ``LutLabel`` change, as the
+        pre-notify function of their ``PropertyValue`` objects.
+        Re-calculates the :meth:`internalName` and clears the cached hash
+        value of the ``label`` as needed, and then calls its owner function
+        (see :meth:`_setOwner`), if one has been set.
+        """
+
+        if propName == 'name':
+            label.__internalName = label.__lowerName()
+
+        if propName in ('name', 'colour'):
+            label.__hash = None
+
+        owner = label.__owner
+
+        if owner is not None:
+            owner = owner.function()
+
+        if owner is not None:
+            owner(value, valid, label, propName)
 
 
     def __str__(self):
@@ -1163,7 +1558,9 @@ class LookupTable(notifier.Notifier):
     index, by directly indexing the ``LookupTable`` instance, or by name, via
     the :meth:`getByName` method.  New label values can be added via the
     :meth:`insert` and :meth:`new` methods. Label values can be removed via
-    the meth:`delete` method.
+    the meth:`delete` method. The values, colours and enabled states of all
+    labels are also available as ``numpy`` arrays, via the :meth:`asArrays`
+    method.
 
 
     *Notifications*
@@ -1203,12 +1600,28 @@ class LookupTable(notifier.Notifier):
 
         self.key      = key
         self.name     = name
-        self.__labels = []
+        self.__labels  = []
+        self.__values  = []
+        self.__byValue = {}
+        self.__max     = 0
+        self.__valarr  = None
+        self.__arrays  = None
+        self.__rgba    = None
+        self.__idxmap  = None
+        self.__byName  = None
         self.__saved  = False
-        self.__name   = 'LookupTable({})_{}'.format(self.name, id(self))
 
-        # The LUT is loaded lazily on first access
-        self.__loaded = False
+        # All labels share a single weak
+        # reference to the __labelChanged
+        # method - see LutLabel._setOwner.
+        self.__labelChangedRef = weakfuncref.WeakFunctionRef(
+            self.__labelChanged)
+
+        # The LUT is loaded lazily on first
+        # access. If there is nothing to load,
+        # we mark it as loaded straight away,
+        # so the lazy-load check is cheap.
+        self.__loaded = lutFile is None
         self.__toLoad = lutFile
 
 
@@ -1219,16 +1632,24 @@ class LookupTable(notifier.Notifier):
 
         def wrapper(self, *args, **kwargs):
 
-            if not self.__loaded and self.__toLoad is not None:
-                self.__load(self.__toLoad)
-                self.__toLoad = None
-                self.__loaded = True
+            if not self.__loaded:
+                self.__lazyLoad()
 
             return func(self, *args, **kwargs)
 
         return wrapper
 
 
+    def __lazyLoad(self):
+        """Used by the :meth:`lazyload` decorator, and by methods which
+        perform the lazy-load check themselves. Loads the LUT file, if it
+        has not already been loaded.
+        """
+        self.__load(self.__toLoad)
+        self.__toLoad = None
+        self.__loaded = True
+
+
     def __str__(self):
         """Returns the name of this ``LookupTable``. """
         return self.name
@@ -1256,8 +1677,7 @@ class LookupTable(notifier.Notifier):
     @lazyload
     def max(self):
         """Returns the maximum current label value in this ``LookupTable``. """
-        if len(self.__labels) == 0: return 0
-        else:                       return self.__labels[-1].value
+        return self.__max
 
 
     @property
@@ -1271,9 +1691,17 @@ class LookupTable(notifier.Notifier):
     @saved.setter
     def saved(self, val):
         """Change the saved state of this ``LookupTable``, and trigger
-        notification on the ``saved`` topic. This property should not
-        be set outside of this module.
+        notification on the ``saved`` topic if it has changed. This
+        property should not be set outside of this module.
         """
+
+        # Every label change marks the lut as
+        # unsaved - we only notify listeners
+        # when the saved state actually
+        # changes, rather than once per edit.
+        if val == self.__saved:
+            return
+
         self.__saved = val
         self.notify(topic='saved')
 
@@ -1286,11 +1714,69 @@ class LookupTable(notifier.Notifier):
 
         .. note:: The ``value`` which is passed in can be either an integer
                   specifying the label value, or a ``LutLabel`` instance.
+                  Use the :meth:`indices` method to look up many values
+                  at once.
         """
-        if not isinstance(value, LutLabel):
-            value = LutLabel(value)
+        if isinstance(value, LutLabel):
+            value = value.value
+
+        # For a single value, bisect on a
+        # list of ints is quicker than
+        # numpy.searchsorted, which is
+        # only used for batch lookups.
+        #
+        # The search is performed on the
+        # label values, rather than on the
+        # LutLabel instances, so only int
+        # comparisons are needed.
+        values = self.__values
+        idx    = bisect.bisect_left(values, value)
+
+        if idx == len(values) or values[idx] != value:
+            raise ValueError('{} is not in lookup table'.format(value))
+
+        return idx
+
+
+    @lazyload
+    def indices(self, values):
+        """Returns the indices in this ``LookupTable`` of the ``LutLabel``
+        instances with the specified values. This is a vectorised version
+        of the :meth:`index` method, for looking up many values at once.
+
+        :arg values: A sequence or ``numpy`` array of label values.
+
+        :returns:    A ``numpy`` array of the same shape as ``values``,
+                     containing the index of each value, or ``-1`` for
+                     values which are not in this ``LookupTable``.
+        """
+
+        values  = np.asarray(values)
+        lutvals = self.__valueArray()
 
-        return self.__labels.index(value)
+        # Integer values are looked up directly
+        # in a dense {value : index} table -
+        # values outside of the table are
+        # redirected to its last entry, which
+        # contains -1. No searching or
+        # comparisons are needed.
+        if values.dtype.kind in 'iu':
+            idxmap = self.__indexMap()
+            oob    = len(idxmap) - 1
+            values = np.where((values >= 0) & (values < oob), values, oob)
+            return idxmap[values]
+
+        if len(lutvals) == 0:
+            return np.full(values.shape, -1, dtype=np.intp)
+
+        # All values are searched for in one
+        # call, and then we check which of
+        # them are actually present.
+        idxs  = np.searchsorted(lutvals, values)
+        idxs  = np.minimum(idxs, len(lutvals) - 1)
+        found = lutvals[idxs] == values
+
+        return np.where(found, idxs, -1)
 
 
     @lazyload
@@ -1301,13 +1787,153 @@ class LookupTable(notifier.Notifier):
         return iter(self.__labels)
 
 
-    @lazyload
     def get(self, value):
         """Returns the :class:`LutLabel` instance associated with the given
         ``value``, or ``None`` if there is no label.
         """
-        try:               return self.__labels[self.index(value)]
-        except ValueError: return None
+
+        # This method is called frequently, so
+        # the lazy-load check is performed here,
+        # rather than via the lazyload decorator.
+        if not self.__loaded:
+            self.__lazyLoad()
+
+        if isinstance(value, LutLabel):
+            value = value.value
+        return self.__byValue.get(value, None)
+
+
+    @lazyload
+    def asArrays(self):
+        """Returns the values, colours, and enabled states of all labels in
+        this ``LookupTable`` as ``numpy`` arrays, so that they can be
+        processed in bulk (e.g. when a lookup table texture is generated),
+        rather than by accessing each :class:`LutLabel` in turn.
+
+        The arrays are created on first access, and are re-created on the
+        next access after any labels are added, removed, or changed, so
+        that a batch of changes only results in a single update - existing
+        arrays are never modified. They are read-only, and should not be
+        modified.
+
+        :returns: A tuple containing:
+
+                   - An ``int32`` array of shape ``(n, )`` containing the
+                     label values, in ascending order.
+                   - A ``float64`` array of shape ``(n, 4)`` containing the
+                     RGBA label colours.
+                   - A ``bool`` array of shape ``(n, )`` containing the
+                     label enabled states.
+        """
+
+        arrays = self.__arrays
+
+        if arrays is None:
+            labels  = self.__labels
+            values  = self.__valueArray()
+            colours = np.array([ll.colour  for ll in labels],
+                               dtype=np.float64).reshape((-1, 4))
+            enabled = np.array([ll.enabled for ll in labels],
+                               dtype=np.bool_)
+
+            colours.flags.writeable = False
+            enabled.flags.writeable = False
+
+            arrays        = values, colours, enabled
+            self.__arrays = arrays
+
+        return arrays
+
+
+    def __valueArray(self):
+        """Used by :meth:`asArrays`, :meth:`indices`, and
+        :meth:`__indexMap`. Returns a read-only ``int32`` array containing
+        all label values. It is created on first use, and re-created after
+        labels are added or removed, but not when they are changed.
+        """
+
+        valarr = self.__valarr
+
+        if valarr is None:
+            valarr                 = np.array(self.__values, dtype=np.int32)
+            valarr.flags.writeable = False
+            self.__valarr          = valarr
+
+        return valarr
+
+
+    def __clearArrays(self, values):
+        """Used by various methods. Clears the cached arrays returned by
+        :meth:`asArrays` and :meth:`asRGBA`, so that they are re-created
+        when they are next accessed.
+
+        :arg values: If ``True``, labels have been added or removed, so the
+                     value array and the value -> index table (see
+                     :meth:`__indexMap`) are also cleared.
+        """
+
+        self.__arrays = None
+        self.__rgba   = None
+
+        if values:
+            self.__valarr = None
+            self.__idxmap = None
+
+
+    def __indexMap(self):
+        """Used by :meth:`indices`. Returns a ``numpy`` array which maps
+        label values to their indices in this ``LookupTable``, with ``-1``
+        for values which are not present. The array contains one extra
+        ``-1`` entry at the end, to which out of range values can be
+        mapped. It is created on first use, and re-created after labels
+        are added or removed.
+        """
+
+        idxmap = self.__idxmap
+
+        if idxmap is None:
+            values = self.__valueArray()
+
+            # Negative values are not valid
+            # label values, so are ignored
+            start = np.searchsorted(values, 0)
+            if len(values) > 0: nvals = max(values[-1] + 1, 0)
+            else:               nvals = 0
+
+            idxmap                 = np.full(nvals + 1, -1, dtype=np.intp)
+            idxmap[values[start:]] = np.arange(start, len(values))
+            self.__idxmap          = idxmap
+
+        return idxmap
+
+
+    @lazyload
+    def asRGBA(self):
+        """Returns the colours and enabled states of all labels in this
+        ``LookupTable`` as a ``uint8`` array of shape ``(n, 4)``, containing
+        RGBA values in the range ``[0, 255]``, in the same order as the
+        arrays returned by :meth:`asArrays`. Disabled labels are given an
+        alpha value of ``0``.
+
+        The array is cached until any labels are added, removed, or
+        changed. It is read-only, and should not be modified. A packed
+        version, with one 32 bit RGBA value per label, can be obtained via
+        ``asRGBA().view(np.uint32)``.
+        """
+
+        rgba = self.__rgba
+
+        if rgba is None:
+            values, colours, enabled = self.asArrays()
+
+            rgba = np.empty((len(values), 4), dtype=np.uint8)
+            rgba[:, :3] = np.floor(colours[:, :3] * 255)
+            rgba[:,  3] = np.where(enabled, 255, 0)
+
+            rgba.flags.writeable = False
+            self.__rgba          = rgba
+
+        return rgba
 
 
     @lazyload
@@ -1316,13 +1942,20 @@ class LookupTable(notifier.Notifier):
         ``name``, or ``None`` if there is no ``LutLabel``. The name comparison
         is case-insensitive.
         """
-        name = name.lower()
 
-        for i, ll in enumerate(self.__labels):
-            if ll.internalName == name:
-                return ll
+        # Labels are looked up by name via a
+        # {internalName : LutLabel} dictionary,
+        # which is re-created after any labels
+        # are renamed or removed. If more than
+        # one label has the same name, the one
+        # with the lowest value is returned.
+        byName = self.__byName
+
+        if byName is None:
+            byName = {ll.internalName : ll for ll in reversed(self.__labels)}
+            self.__byName = byName
 
-        return None
+        return byName.get(name.lower(), None)
 
 
     @lazyload
@@ -1330,7 +1963,18 @@ class LookupTable(notifier.Notifier):
         """Add a new :class:`LutLabel` with value ``max() + 1``, and add it
         to this ``LookupTable``.
         """
-        return self.insert(self.max() + 1, name, colour, enabled)
+
+        # The new label value is greater than
+        # all existing values, so there is no
+        # need to check for duplicates, or to
+        # search for an insertion point.
+        value = self.__max + 1
+
+        if value > 65535:
+            raise ValueError('Lookup table values must be '
+                             '16 bit unsigned integers.')
+
+        return self.__doInsert(value, name, colour, enabled, True)
 
 
     @lazyload
@@ -1346,15 +1990,51 @@ class LookupTable(notifier.Notifier):
             raise ValueError('Lookup table values must be '
                              '16 bit unsigned integers.')
 
-        if self.get(value) is not None:
+        if value in self.__byValue:
             raise ValueError('Value {} is already in '
                              'lookup table'.format(value))
 
+        return self.__doInsert(value, name, colour, enabled, False)
+
+
+    def __doInsert(self, value, name, colour, enabled, atEnd):
+        """Used by :meth:`new` and :meth:`insert`. Creates a new
+        :class:`LutLabel` and adds it to this ``LookupTable``. The
+        ``value`` is assumed to be valid, and not already present.
+
+        :arg atEnd: If ``True``, the ``value`` is assumed to be greater
+                    than all existing label values, and the label is
+                    appended to the end of the label list.
+
+        :returns: The newly created ``LutLabel`` instance.
+        """
+
         label = LutLabel(value, name, colour, enabled)
-        label.addGlobalListener(self.__name, self.__labelChanged)
+        label._setOwner(self.__labelChangedRef)
+
+        if atEnd:
+            idx = len(self.__labels)
+            self.__labels.append(label)
+            self.__values.append(value)
+
+        # Slice assignment is a little
+        # quicker than list.insert
+        else:
+            idx = bisect.bisect(self.__values, value)
+            self.__labels[idx:idx] = [label]
+            self.__values[idx:idx] = [value]
+
+        if value > self.__max:
+            self.__max = value
+        self.__byValue[value] = label
 
-        idx = bisect.bisect(self.__labels, label)
-        self.__labels.insert(idx, label)
+        self.__clearArrays(True)
+
+        byName = self.__byName
+        if byName is not None:
+            other = byName.get(label.internalName, None)
+            if other is None or other.value > value:
+                byName[label.internalName] = label
 
         self.saved = False
         self.notify(topic='added', value=(label, idx))
@@ -1372,8 +2052,18 @@ class LookupTable(notifier.Notifier):
 
         idx   = self.index(value)
         label = self.__labels.pop(idx)
+        del self.__values[idx]
+
+        if label.value == self.__max:
+            if len(self.__values) == 0: self.__max = 0
+            else:                       self.__max = self.__values[-1]
+
+        self.__byValue.pop(label.value)
+        self.__byName = None
+
+        self.__clearArrays(True)
 
-        label.removeGlobalListener(self.__name)
+        label._setOwner(None)
 
         self.notify(topic='removed', value=(label, idx))
         self.saved = False
@@ -1384,16 +2074,22 @@ class LookupTable(notifier.Notifier):
         """Saves this ``LookupTable`` instance to the specified ``lutFile``.
         """
 
-        with open(lutFile, 'wt') as f:
-            for label in self:
-                value  = label.value
-                colour = label.colour
-                name   = label.name
+        # The file contents are built up
+        # in memory, and written in one go.
+        lines = []
+
+        for label in self:
+            value  = label.value
+            colour = label.colour
+            name   = label.name
 
-                tkns   = [value, colour[0], colour[1], colour[2], name]
-                line   = ' '.join(map(str, tkns))
+            tkns   = [value, colour[0], colour[1], colour[2], name]
+            lines.append(' '.join(map(str, tkns)))
 
-                f.write('{}\n'.format(line))
+        lines.append('')
+
+        with open(lutFile, 'wt') as f:
+            f.write('\n'.join(lines))
 
         self.saved = True
 
@@ -1404,47 +2100,110 @@ class LookupTable(notifier.Notifier):
         """
 
         # Calling insert() to add new labels is very
-        # slow, because the labels are inserted in
-        # ascending order. But because we require
-        # .lut files to be sorted, we can create the
-        # lookup table much faster.
-        def parseLabel(line):
-            tkns = line.split()
+        # slow, because each label is inserted in
+        # ascending order. Instead, we parse all of
+        # the labels, and then sort them once if
+        # they are not already sorted (.lut files
+        # should be in ascending order).
+        #
+        # Each line is split once, into the label
+        # value, colour, and the remainder of the
+        # line, which is the name. Blank lines
+        # produce no tokens, and are skipped.
+        # Parsing is done inline, rather than in
+        # a separate function, to avoid a call
+        # per line.
+        with open(lutFile, 'rt') as f:
+            lines = f.read().splitlines()
 
-            label = int(     tkns[0])
-            r     = float(   tkns[1])
-            g     = float(   tkns[2])
-            b     = float(   tkns[3])
-            lName = ' '.join(tkns[4:])
+        rows   = []
+        values = []
 
-            return LutLabel(label, lName, (r, g, b), label > 0)
+        for line in lines:
 
-        with open(lutFile, 'rt') as f:
+            tkns = line.split(None, 4)
+
+            if not tkns:
+                continue
+
+            value = int(tkns[0])
+
+            if len(tkns) > 4: lName = tkns[4].rstrip()
+            else:             lName = ''
+
+            rows.append((value,
+                         float(tkns[1]),
+                         float(tkns[2]),
+                         float(tkns[3]),
+                         lName))
+            values.append(value)
+
+        # The ordering check is
+        # performed on an array
+        # of the label values.
+        valarr = np.array(values, dtype=np.int64)
+
+        if len(valarr) > 0 and valarr.min() < 0:
+            raise ValueError('{} file contains negative '
+                             'labels!'.format(lutFile))
 
-            last   = None
-            lines  = [l.strip() for l in f.readlines()]
-            labels = []
+        if np.any(np.diff(valarr) <= 0):
 
-            for line in lines:
+            if len(np.unique(valarr)) != len(valarr):
+                raise ValueError('{} file contains duplicate '
+                                 'labels!'.format(lutFile))
 
-                if line == '':
-                    continue
+            log.warning('{} file is not in ascending '
+                        'order - sorting labels'.format(lutFile))
 
-                label = parseLabel(line)
-                lval  = label.value
+            # Rows are (value, r, g, b, name)
+            # tuples, and the values are unique,
+            # so the rows can be sorted directly,
+            # without a key function.
+            rows.sort()
+            values = [r[0] for r in rows]
+            valarr = np.array(values, dtype=np.int64)
 
-                if (last is not None) and (lval <= last):
-                    raise ValueError('{} file is not in ascending '
-                                     'order!'.format(lutFile))
+        # The numeric columns are converted
+        # into the asArrays arrays in one
+        # step, rather than by querying
+        # every LutLabel. Colours are
+        # clamped to [0, 1], as the
+        # LutLabel.colour property does.
+        nums    = np.array([r[:4] for r in rows], dtype=np.float64)
+        nums    = nums.reshape((-1, 4))
+        colours = np.ones((len(rows), 4), dtype=np.float64)
 
-                labels.append(label)
-                last = lval
+        colours[:, :3] = np.clip(nums[:, 1:], 0, 1)
 
-            self.__labels = labels
-            self.saved    = True
+        labels = [LutLabel(v, n, (r, g, b), v > 0)
+                  for v, r, g, b, n in rows]
 
-            for label in labels:
-                label.addGlobalListener(self.__name, self.__labelChanged)
+        self.__labels  = labels
+        self.__values  = values
+        self.__byValue = dict(zip(values, labels))
+        self.__max     = values[-1] if len(values) > 0 else 0
+        self.__byName  = None
+
+        self.__clearArrays(True)
+
+        enabled       = valarr > 0
+        valarr        = valarr.astype(np.int32)
+        self.__valarr = valarr
+        self.__arrays = valarr, colours, enabled
+        self.saved    = True
+
+        for arr in self.__arrays:
+            arr.flags.writeable = False
+
+        # Rather than registering a listener
+        # on every label (which is slow), each
+        # label is given a reference to the
+        # __labelChanged method.
+        owner = self.__labelChangedRef
+
+        for label in labels:
+            label._setOwner(owner)
 
 
     def __labelChanged(self, value, valid, label, propName):
@@ -1452,7 +2211,19 @@ class LookupTable(notifier.Notifier):
         notification on the ``label`` topic.
         """
 
+        idx = self.index(label)
+
+        # The label arrays are re-created
+        # when they are next accessed, so
+        # that a batch of changes does not
+        # result in a copy for every change
+        if propName in ('colour', 'enabled'):
+            self.__clearArrays(False)
+
+        if propName == 'name':
+            self.__byName = None
+
         if propName in ('name', 'colour'):
             self.saved = False
 
-        self.notify(topic='label', value=(label, self.index(label)))
+        self.notify(topic='label', value=(label, idx))
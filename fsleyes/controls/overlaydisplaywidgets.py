@@ -24,89 +24,175 @@ import os.path as op
 import            sys
 import            copy
 import            functools
+import            itertools
 
-import            wx
-
-import fsl.utils.idle                     as idle
 import fsleyes_props                      as props
-import fsleyes_widgets                    as fwidgets
-import fsleyes_widgets.utils.typedict     as td
 import fsleyes.strings                    as strings
 import fsleyes.colourmaps                 as fslcm
-import fsleyes.actions.loadcolourmap      as loadcmap
-import fsleyes.actions.loadvertexdata     as loadvdata
 
+# wx, and the modules which are only needed
+# by the custom widget functions (at the
+# bottom of this module), are imported
+# inside those functions, so they are only
+# loaded when a widget is actually built.
+
+
+_THINGS = {}
+"""Cache used by :func:`_getThing`, containing the value returned by every
+``_init*`` function that has been called, as ``{(prefix, className, args)
+: value}`` mappings.
+"""
+
+
+_RESULTS = {}
+"""Cache used by the :func:`_cached` decorator, containing the merged
+results of the ``get*`` functions, as ``{(function, type, args) : result}``
+mappings.
+"""
+
+
+def _cached(func):
+    """Decorator used on the ``get*`` functions. Their results only depend
+    on the type of the target, and on the other arguments, so are cached in
+    :attr:`_RESULTS`. Cached results are shared, so must not be modified.
+    """
+
+    @functools.wraps(func)
+    def wrapper(target, *args, **kwargs):
 
-_PROPERTIES      = td.TypeDict()
-_3D_PROPERTIES   = td.TypeDict()
-_WIDGET_SPECS    = td.TypeDict()
-_3D_WIDGET_SPECS = td.TypeDict()
+        if isinstance(target, type): ttype = target
+        else:                        ttype = type(target)
 
+        key    = (func.__name__, ttype, args, tuple(sorted(kwargs.items())))
+        result = _RESULTS.get(key, None)
 
+        if result is None and not _precompute.called:
+            _precompute()
+            result = _RESULTS.get(key, None)
 
+        if result is None:
+            result        = func(target, *args, **kwargs)
+            _RESULTS[key] = result
 
-def _merge_dicts(d1, d2):
-    d3 = d1.copy()
-    d3.update(d2)
-    return d3
+        return result
 
+    return wrapper
+
+
+def _precompute():
+    """Called by the :func:`_cached` decorator on first use. Generates and
+    caches the property lists and widget specs for the :class:`.Display`
+    class, and for every :class:`.DisplayOpts` type, so that all subsequent
+    calls (e.g. when the selected overlay or its type changes) are a single
+    dictionary lookup.
+    """
 
+    import fsleyes.displaycontext as fsldc
+
+    _precompute.called = True
+
+    ttypes = [fsldc.Display] + list(fsldc.DISPLAY_OPTS_MAP.values())
+
+    for ttype in ttypes:
+        for threedee in (False, True):
+            getPropertyList(ttype, threedee)
+            getWidgetSpecs( ttype, threedee)
+        get3DPropertyList(ttype)
+        get3DWidgetSpecs( ttype)
+
+
+_precompute.called = False
+
+
+@_cached
 def getPropertyList(target, threedee=False):
 
-    plist = _getThing(target, '_initPropertyList_', _PROPERTIES, threedee)
+    plist = _getThing(target, '_initPropertyList_', threedee)
 
     if plist is None:
         return []
 
-    return functools.reduce(lambda a, b: a + b, plist)
+    return list(itertools.chain.from_iterable(plist))
 
 
+@_cached
 def get3DPropertyList(target):
 
-    plist = _getThing(target, '_init3DPropertyList_', _3D_PROPERTIES)
+    plist = _getThing(target, '_init3DPropertyList_')
 
     if plist is None:
         return []
 
-    return functools.reduce(lambda a, b: a + b, plist)
+    return list(itertools.chain.from_iterable(plist))
 
 
+@_cached
 def getWidgetSpecs(target, threedee=False):
 
-    sdicts = _getThing(target, '_initWidgetSpec_', _WIDGET_SPECS, threedee)
+    sdicts = _getThing(target, '_initWidgetSpec_', threedee)
 
     if sdicts is None:
         return {}
 
-    return functools.reduce(_merge_dicts, sdicts)
+    return _mergeDicts(sdicts)
 
 
+@_cached
 def get3DWidgetSpecs(target):
 
-    sdicts = _getThing(target, '_init3DWidgetSpec_', _3D_WIDGET_SPECS)
+    sdicts = _getThing(target, '_init3DWidgetSpec_')
 
     if sdicts is None:
         return {}
 
-    return functools.reduce(_merge_dicts, sdicts)
+    return _mergeDicts(sdicts)
+
+
+def _mergeDicts(dicts):
+    # All of the dicts are merged into one
+    # new dict, in order, so entries in later
+    # dicts take precedence over earlier ones.
+    # The first dict is copied in a single
+    # construction, rather than being
+    # updated into an empty dict.
+    merged = dict(dicts[0])
+    for d in dicts[1:]:
+        merged.update(d)
+    return merged
+
+
+def _getThing(target, prefix, *args):
+
+    # The init functions for the target type
+    # and its bases are found by _getInitFuncs,
+    # which walks the MRO. The value returned
+    # by each function is cached, so that it
+    # is shared between all sub-classes.
+    keys, funcs = _getInitFuncs(prefix, target)
+
+    if len(funcs) == 0:
+        return None
 
+    things = []
 
-def _getThing(target, prefix, thingDict, *args, **kwargs):
+    for key, func in zip(keys, funcs):
 
-    def _makeKey(t):
-        return (t, str(args), str(kwargs))
+        tkey  = (prefix, key, args)
+        thing = _THINGS.get(tkey, None)
 
-    tkey = _makeKey(target)
+        if thing is None:
+            thing         = func(*args)
+            _THINGS[tkey] = thing
 
-    if thingDict.get(tkey, None, exact=True) is None:
+        things.append(thing)
 
-        keys, funcs = _getInitFuncs(prefix, target)
+    return things
 
-        for key, func in zip(keys, funcs):
-            key = _makeKey(key)
-            thingDict[key] = func(*args, **kwargs)
 
-    return thingDict.get(tkey, None, allhits=True)
+_INIT_FUNCS = {}
+"""Cache used by :func:`_getInitFuncs`, containing
+``{(prefix, type) : (keys, funcs)}`` mappings.
+"""
 
 
 def _getInitFuncs(prefix, target):
@@ -114,28 +200,52 @@ def _getInitFuncs(prefix, target):
     if isinstance(target, type): ttype = target
     else:                        ttype = type(target)
 
-    key   = ttype.__name__
-    bases = ttype.__bases__
+    cached = _INIT_FUNCS.get((prefix, ttype), None)
+
+    if cached is not None:
+        return cached
 
-    thismod  = sys.modules[__name__]
-    initFunc = '{}{}'.format(prefix, key)
-    initFunc = getattr(thismod, initFunc, None)
+    # The class hierarchy is walked
+    # in MRO order, looking for an
+    # init function for each class.
+    thismod   = sys.modules[__name__]
+    keys      = []
+    initFuncs = []
 
-    if initFunc is None:
-        return [], []
+    for cls in ttype.__mro__:
 
-    keys      = [key]
-    initFuncs = [initFunc]
+        key      = cls.__name__
+        initFunc = getattr(thismod, prefix + key, None)
 
-    for base in bases:
-        bkeys, bfuncs = _getInitFuncs(prefix, base)
+        if initFunc is not None:
+            keys     .append(key)
+            initFuncs.append(initFunc)
 
-        keys     .extend(bkeys)
-        initFuncs.extend(bfuncs)
+    _INIT_FUNCS[prefix, ttype] = keys, initFuncs
 
     return keys, initFuncs
 
 
+_cmapLabel = fslcm.getColourMapLabel
+"""Used by the colour map widget specs to generate colour map labels. Bound
+once here, rather than being looked up on every widget spec.
+"""
+
+
+def _imageName(img):
+    """Used by some widget specs to generate labels for an image. """
+    if img is None: return 'None'
+    else:           return img.name
+
+
+def _vertexDataName(vdata):
+    """Used by the :class:`.MeshOpts` widget specs to generate labels for
+    vertex data files.
+    """
+    if vdata is None: return 'None'
+    else:             return op.basename(vdata)
+
+
 def _initPropertyList_Display(threedee):
     return ['name',
             'overlayType',
@@ -211,32 +321,26 @@ def _initPropertyList_TensorOpts(threedee):
 
 
 def _initPropertyList_MeshOpts(threedee):
-    plist = ['refImage',
-             'coordSpace',
-             'outline',
-             'outlineWidth',
-             'colour',
-             'custom_vertexData',
-             'vertexDataIndex',
-             'custom_lut',
-             'custom_cmap',
-             'cmapResolution',
-             'interpolateCmaps',
-             'invert',
-             'invertClipping',
-             'discardClipped',
-             'linkLowRanges',
-             'linkHighRanges',
-             'displayRange',
-             'clippingRange']
-
-    # Remove outline
-    # options for 3D
-    if threedee:
-        plist.pop(3)
-        plist.pop(2)
-
-    return plist
+
+    # Outline options
+    # are 2D only
+    if threedee: outline = []
+    else:        outline = ['outline', 'outlineWidth']
+
+    return ['refImage', 'coordSpace'] + outline + ['colour',
+                                                   'custom_vertexData',
+                                                   'vertexDataIndex',
+                                                   'custom_lut',
+                                                   'custom_cmap',
+                                                   'cmapResolution',
+                                                   'interpolateCmaps',
+                                                   'invert',
+                                                   'invertClipping',
+                                                   'discardClipped',
+                                                   'linkLowRanges',
+                                                   'linkHighRanges',
+                                                   'displayRange',
+                                                   'clippingRange']
 
 
 def _init3DPropertyList_MeshOpts():
@@ -282,16 +386,22 @@ def _initWidgetSpec_Display(threedee):
 
 
 def _initWidgetSpec_ColourMapOpts(threedee):
+
+    # The display and clipping range
+    # widgets use the same labels
+    rangeMin = strings.choices['ColourMapOpts.displayRange.min']
+    rangeMax = strings.choices['ColourMapOpts.displayRange.max']
+
     return {
         'custom_cmap'              : _ColourMapOpts_ColourMapWidget,
         'custom_overrideDataRange' : _VolumeOpts_OverrideDataRangeWidget,
         'cmap'              : props.Widget(
             'cmap',
-            labels=fslcm.getColourMapLabel),
+            labels=_cmapLabel),
         'useNegativeCmap' : props.Widget('useNegativeCmap'),
         'negativeCmap'    : props.Widget(
             'negativeCmap',
-            labels=fslcm.getColourMapLabel,
+            labels=_cmapLabel,
             dependencies=['useNegativeCmap'],
             enabledWhen=lambda i, unc : unc),
         'cmapResolution'  : props.Widget(
@@ -308,23 +418,17 @@ def _initWidgetSpec_ColourMapOpts(threedee):
             'displayRange',
             showLimits=False,
             slider=True,
-            labels=[strings.choices['ColourMapOpts.displayRange.min'],
-                    strings.choices['ColourMapOpts.displayRange.max']]),
+            labels=[rangeMin, rangeMax]),
         'clippingRange'  : props.Widget(
             'clippingRange',
             showLimits=False,
             slider=True,
-            labels=[strings.choices['ColourMapOpts.displayRange.min'],
-                    strings.choices['ColourMapOpts.displayRange.max']]),
+            labels=[rangeMin, rangeMax]),
     }
 
 
 def _initWidgetSpec_VolumeOpts(threedee):
 
-    def imageName(img):
-        if img is None: return 'None'
-        else:           return img.name
-
     return {
         'custom_volume'  : _NiftiOpts_VolumeWidget,
         'volume'         : props.Widget(
@@ -343,7 +447,7 @@ def _initWidgetSpec_VolumeOpts(threedee):
             labels=strings.choices['VolumeOpts.interpolation']),
         'clipImage'      : props.Widget(
             'clipImage',
-            labels=imageName),
+            labels=_imageName),
         'custom_overrideDataRange' : _VolumeOpts_OverrideDataRangeWidget,
         'enableOverrideDataRange'  : props.Widget(
             'enableOverrideDataRange'),
@@ -424,23 +528,19 @@ def _initWidgetSpec_LabelOpts(threedee):
 
 
 def _initWidgetSpec_VectorOpts(threedee):
-    def imageName(img):
-        if img is None: return 'None'
-        else:           return img.name
-
     return {
         'colourImage'   : props.Widget(
             'colourImage',
-            labels=imageName),
+            labels=_imageName),
         'modulateImage' : props.Widget(
             'modulateImage',
-            labels=imageName,
+            labels=_imageName,
             dependencies=['colourImage'],
             enabledWhen=lambda o, ci: ci is None),
-        'clipImage'     : props.Widget('clipImage', labels=imageName),
+        'clipImage'     : props.Widget('clipImage', labels=_imageName),
         'cmap'          : props.Widget(
             'cmap',
-            labels=fslcm.getColourMapLabel,
+            labels=_cmapLabel,
             dependencies=['colourImage'],
             enabledWhen=lambda o, ci: ci is not None),
         'clippingRange' : props.Widget(
@@ -549,7 +649,7 @@ def _initWidgetSpec_SHOpts(threedee):
             enabledWhen=lambda o, ci: ci is None),
         'cmap' : props.Widget(
             'cmap',
-            labels=fslcm.getColourMapLabel,
+            labels=_cmapLabel,
             dependencies=['colourImage', 'colourMode'],
             enabledWhen=lambda o, ci, cm: ci is not None or cm == 'radius'),
         'xColour'         : props.Widget(
@@ -586,14 +686,6 @@ def _initWidgetSpec_SHOpts(threedee):
 
 def _initWidgetSpec_MeshOpts(threedee):
 
-    def imageName(img):
-        if img is None: return 'None'
-        else:           return img.name
-
-    def vertexDataName(vdata):
-        if vdata is None: return 'None'
-        else:             return op.basename(vdata)
-
     def colourEnabledWhen(opts, vdata, useLut):
         return (vdata is not None) and (not useLut)
 
@@ -612,7 +704,7 @@ def _initWidgetSpec_MeshOpts(threedee):
             showLimits=False,
             dependencies=['outline', 'vertexData'],
             enabledWhen=lambda op, o, v: o or v is not None),
-        'refImage'     : props.Widget('refImage', labels=imageName),
+        'refImage'     : props.Widget('refImage', labels=_imageName),
         'coordSpace'   : props.Widget(
             'coordSpace',
             enabledWhen=lambda o, ri: ri != 'none',
@@ -622,7 +714,7 @@ def _initWidgetSpec_MeshOpts(threedee):
         'custom_vertexData' : _MeshOpts_VertexDataWidget,
         'vertexData'   : props.Widget(
             'vertexData',
-            labels=vertexDataName),
+            labels=_vertexDataName),
         'vertexDataIndex' : props.Widget(
             'vertexDataIndex',
             showLimits=False,
@@ -643,7 +735,7 @@ def _initWidgetSpec_MeshOpts(threedee):
         # for custom enabledWhen behaviour.
         'cmap'           : props.Widget(
             'cmap',
-            labels=fslcm.getColourMapLabel,
+            labels=_cmapLabel,
             **colourKwargs),
 
         'useNegativeCmap' : props.Widget(
@@ -651,7 +743,7 @@ def _initWidgetSpec_MeshOpts(threedee):
             **colourKwargs),
         'negativeCmap'    : props.Widget(
             'negativeCmap',
-            labels=fslcm.getColourMapLabel,
+            labels=_cmapLabel,
             **colourKwargs),
         'cmapResolution'  : props.Widget(
             'cmapResolution',
@@ -722,6 +814,9 @@ def _ColourMapOpts_ColourMapWidget(
               containing the extra widgets that were added.
     """
 
+    import                               wx
+    import fsleyes.actions.loadcolourmap as loadcmap
+
     # Button to load a new
     # colour map from file
     loadAction = loadcmap.LoadColourMapAction(overlayList, displayCtx)
@@ -731,9 +826,10 @@ def _ColourMapOpts_ColourMapWidget(
 
     loadAction.bindToWidget(panel, wx.EVT_BUTTON, loadButton)
 
-    cmap       = getWidgetSpecs(target, threedee)['cmap']
-    negCmap    = getWidgetSpecs(target, threedee)['negativeCmap']
-    useNegCmap = getWidgetSpecs(target, threedee)['useNegativeCmap']
+    specs      = getWidgetSpecs(target, threedee)
+    cmap       = specs['cmap']
+    negCmap    = specs['negativeCmap']
+    useNegCmap = specs['useNegativeCmap']
 
     cmap       = props.buildGUI(parent, target, cmap)
     negCmap    = props.buildGUI(parent, target, negCmap)
@@ -763,8 +859,11 @@ def _NiftiOpts_VolumeWidget(
     :attr:`.NiftiOpts.volume` and :attr:`.NiftiOpts.volumeDim` properties.
     """
 
-    volume    = getWidgetSpecs(target, threedee)['volume']
-    volumeDim = getWidgetSpecs(target, threedee)['volumeDim']
+    import wx
+
+    specs     = getWidgetSpecs(target, threedee)
+    volume    = specs['volume']
+    volumeDim = specs['volumeDim']
 
     volume    = props.buildGUI(parent, target, volume)
     volumeDim = props.buildGUI(parent, target, volumeDim)
@@ -796,9 +895,12 @@ def _VolumeOpts_OverrideDataRangeWidget(
     :returns: a ``wx.Sizer`` containing all of the widgets.
     """
 
+    import wx
+
     # Override data range widget
-    enable   = getWidgetSpecs(target, threedee)['enableOverrideDataRange']
-    ovrRange = getWidgetSpecs(target, threedee)['overrideDataRange']
+    specs    = getWidgetSpecs(target, threedee)
+    enable   = specs['enableOverrideDataRange']
+    ovrRange = specs['overrideDataRange']
 
     enable   = props.buildGUI(parent, target, enable)
     ovrRange = props.buildGUI(parent, target, ovrRange)
@@ -823,6 +925,9 @@ def _VolumeOpts_3DClipPlanes(
     :attr:`.VolumeOpts.numClipPlanes` setting.
     """
 
+    import fsl.utils.idle  as idle
+    import fsleyes_widgets as fwidgets
+
     # Whenever numClipPlanes changes, we
     # need to refresh the clip plane widgets.
     # Easiest way to do this is to tell the
@@ -845,32 +950,37 @@ def _VolumeOpts_3DClipPlanes(
                        weak=False)
 
     numPlanes    = target.numClipPlanes
-    numPlaneSpec = get3DWidgetSpecs(target)['numClipPlanes']
-    clipMode     = get3DWidgetSpecs(target)['clipMode']
-    showPlanes   = get3DWidgetSpecs(target)['showClipPlanes']
-    position     = get3DWidgetSpecs(target)['clipPosition']
-    azimuth      = get3DWidgetSpecs(target)['clipAzimuth']
-    inclination  = get3DWidgetSpecs(target)['clipInclination']
+    specs3d      = get3DWidgetSpecs(target)
+    numPlaneSpec = specs3d['numClipPlanes']
+    clipMode     = specs3d['clipMode']
+    showPlanes   = specs3d['showClipPlanes']
+    position     = specs3d['clipPosition']
+    azimuth      = specs3d['clipAzimuth']
+    inclination  = specs3d['clipInclination']
 
     specs = [numPlaneSpec, showPlanes, clipMode]
 
     if numPlanes == 0:
         return specs, None
 
-    positions    = [copy.deepcopy(position)    for i in range(numPlanes)]
-    azimuths     = [copy.deepcopy(azimuth)     for i in range(numPlanes)]
-    inclinations = [copy.deepcopy(inclination) for i in range(numPlanes)]
-
+    # Each clip plane gets its own copy of the
+    # position/azimuth/inclination specs. The
+    # specs are not modified, other than their
+    # index, so shallow copies are sufficient.
     for i in range(numPlanes):
 
-        positions[i]   .index = i
-        azimuths[i]    .index = i
-        inclinations[i].index = i
+        planePos = copy.copy(position)
+        planeAzi = copy.copy(azimuth)
+        planeInc = copy.copy(inclination)
+
+        planePos.index = i
+        planeAzi.index = i
+        planeInc.index = i
 
         label = strings.labels[panel, 'clipPlane#'].format(i + 1)
         label = props.Label(label=label)
 
-        specs.extend((label, positions[i], azimuths[i], inclinations[i]))
+        specs.extend((label, planePos, planeAzi, planeInc))
 
     return specs, None
 
@@ -888,6 +998,9 @@ def _MeshOpts_VertexDataWidget(
     data.
     """
 
+    import                                wx
+    import fsleyes.actions.loadvertexdata as loadvdata
+
     loadAction = loadvdata.LoadVertexDataAction(overlayList, displayCtx)
     loadButton = wx.Button(parent)
     loadButton.SetLabel(strings.labels[panel, 'loadVertexData'])
@@ -916,9 +1029,12 @@ def _MeshOpts_LutWidget(
     widget, and also a widget for :attr:`.MeshOpts.useLut`.
     """
 
+    import wx
+
     # enable lut widget
-    lut    = getWidgetSpecs(target, threedee)['lut']
-    enable = getWidgetSpecs(target, threedee)['useLut']
+    specs  = getWidgetSpecs(target, threedee)
+    lut    = specs['lut']
+    enable = specs['useLut']
 
     lut    = props.buildGUI(parent, target, lut)
     enable = props.buildGUI(parent, target, enable)
@@ -11,11 +11,13 @@ panel which displays information about the currently selected overlay.
 
 import logging
 import collections
+import json
 
 import wx
 
 import numpy as np
 
+import fsl.utils.idle                 as idle
 import fsl.data.image                 as fslimage
 import fsl.data.constants             as constants
 import fsleyes_widgets.utils.typedict as td
@@ -33,6 +35,12 @@ now.
 """
 
 
+HTML_CACHE_SIZE = 16
+"""Maximum number of rendered HTML pages which are cached by each
+:class:`OverlayInfoPanel`.
+"""
+
+
 if USE_HTML2: import wx.html2 as wxhtml
 else:         import wx.html  as wxhtml
 
@@ -40,6 +48,18 @@ else:         import wx.html  as wxhtml
 log = logging.getLogger(__name__)
 
 
+_ROW_EVEN = '<tr bgcolor="#cdcdff"><td><b>{}</b></td><td>{}</td></tr>'
+"""Template used by :meth:`OverlayInfoPanel.__formatOverlayInfo` for
+even-numbered information rows.
+"""
+
+
+_ROW_ODD = '<tr bgcolor="#f0f0f0"><td><b>{}</b></td><td>{}</td></tr>'
+"""Template used by :meth:`OverlayInfoPanel.__formatOverlayInfo` for
+odd-numbered information rows.
+"""
+
+
 # The wx.html2.WebView.SetPage method differs from
 # the wx.html.HtmlWindow.SetPage method - it requires
 # two parameters. Here we're sub-classing the
@@ -119,7 +139,26 @@ class OverlayInfoPanel(fslpanel.FSLeyesPanel):
                                 self.__selectedOverlayChanged)
         overlayList.addListener('overlays',
                                 self.name,
-                                self.__selectedOverlayChanged)
+                                self.__overlayListChanged)
+
+        # Rendered HTML pages are cached in this
+        # dict, so they do not have to be re-
+        # generated when the user selects an
+        # overlay that has already been shown.
+        # See the __updateInformation method.
+        self.__htmlCache = collections.OrderedDict()
+
+        # The overlay that the current page
+        # is for, and the name shown in the
+        # page title - see the __setPage and
+        # __updateTitle methods.
+        self.__pageOverlay = None
+        self.__pageName    = None
+
+        # Name of the idle task used to
+        # update the page - see the
+        # __scheduleUpdate method.
+        self.__updateTask = '{}_updateInformation'.format(self.name)
 
         self.__currentOverlay = None
         self.__currentDisplay = None
@@ -144,6 +183,14 @@ class OverlayInfoPanel(fslpanel.FSLeyesPanel):
         fslpanel.FSLeyesPanel.destroy(self)
 
 
+    def __overlayListChanged(self, *a):
+        """Called when the :class:`.OverlayList` changes. Clears the HTML
+        cache, and calls :meth:`__selectedOverlayChanged`.
+        """
+        self.__htmlCache.clear()
+        self.__selectedOverlayChanged()
+
+
     def __selectedOverlayChanged(self, *a):
         """Called when the :class:`.OverlayList` or
         :attr:`.DisplayContext.selectedOverlay` changes. Refreshes the
@@ -152,18 +199,21 @@ class OverlayInfoPanel(fslpanel.FSLeyesPanel):
 
         overlay = self.displayCtx.getSelectedOverlay()
 
+        # The selection has not changed (e.g.
+        # an unrelated overlay has been added
+        # to or removed from the overlay list)
+        if overlay is not None and overlay is self.__currentOverlay:
+            return
+
         # Overlay list is empty
         if overlay is None:
-            self.__info.SetPage('', '')
-            self.__info.Refresh()
+            self.__deregisterOverlay()
+            self.__setPage('')
             return
 
         self.__deregisterOverlay()
-
-        if overlay is not None:
-            self.__registerOverlay(overlay)
-
-        self.__updateInformation()
+        self.__registerOverlay(overlay)
+        self.__scheduleUpdate()
 
 
     _optProps = td.TypeDict({
@@ -178,6 +228,37 @@ class OverlayInfoPanel(fslpanel.FSLeyesPanel):
     """
 
 
+    _optPropsCache = {}
+    """Cache used by the :meth:`__getOptProps` method, containing
+    ``{type : (propName, ...)}`` mappings.
+    """
+
+
+    _overlayTopics = ('saveState', 'transform')
+    """Notification topics on :class:`.Nifti` overlays which, when notified,
+    should result in the information being refreshed - saving an image may
+    change its data source and header, and the header transform is shown
+    on the page. Used by the :meth:`__registerOverlay` and
+    :meth:`__deregisterOverlay` methods.
+    """
+
+
+    def __getOptProps(self, overlay):
+        """Returns a tuple containing the names of the :attr:`_optProps` for
+        the given overlay. The ``TypeDict`` lookup is only performed once for
+        each overlay type.
+        """
+
+        otype    = type(overlay)
+        optProps = OverlayInfoPanel._optPropsCache.get(otype, None)
+
+        if optProps is None:
+            optProps = tuple(OverlayInfoPanel._optProps.get(overlay, []))
+            OverlayInfoPanel._optPropsCache[otype] = optProps
+
+        return optProps
+
+
     def __registerOverlay(self, overlay):
         """Registers property listeners with the given overlay so the
         information can be refreshed when necessary.
@@ -197,9 +278,13 @@ class OverlayInfoPanel(fslpanel.FSLeyesPanel):
                             self.name,
                             self.__overlayTypeChanged)
 
-        for propName in OverlayInfoPanel._optProps.get(overlay, []):
+        for propName in self.__getOptProps(overlay):
             opts.addListener(propName, self.name, self.__overlayOptsChanged)
 
+        if isinstance(overlay, fslimage.Nifti):
+            for topic in OverlayInfoPanel._overlayTopics:
+                overlay.register(self.name, self.__overlayChanged, topic)
+
 
     def __deregisterOverlay(self):
         """De-registers property listeners from the overlay that was
@@ -220,23 +305,69 @@ class OverlayInfoPanel(fslpanel.FSLeyesPanel):
         display.removeListener('name',        self.name)
         display.removeListener('overlayType', self.name)
 
-        for propName in OverlayInfoPanel._optProps[overlay]:
+        for propName in self.__getOptProps(overlay):
             opts.removeListener(propName, self.name)
 
+        if isinstance(overlay, fslimage.Nifti):
+            for topic in OverlayInfoPanel._overlayTopics:
+                overlay.deregister(self.name, topic)
+
 
     def __overlayTypeChanged(self, *a):
         """Called when the :attr:`.Display.overlayType` for the current
         overlay changes. Re-registers with the ``Display`` and
         ``DisplayOpts`` instances associated with the overlay.
         """
+        self.__clearCache(self.__currentOverlay)
+        self.__deregisterOverlay()
         self.__selectedOverlayChanged()
 
 
     def __overlayNameChanged(self, *a):
         """Called when the :attr:`.Display.name` for the current overlay
-        changes. Updates the information display.
+        changes. Updates the information display. When the ``wx.html2``
+        renderer is in use, and the current page is for the current overlay,
+        only the page title is updated.
         """
-        self.__updateInformation()
+
+        overlay = self.__currentOverlay
+
+        self.__clearCache(overlay)
+
+        # The title can only be patched if the
+        # page being shown is for the current
+        # overlay, and is not about to be
+        # replaced by a pending update.
+        if USE_HTML2                      and \
+           overlay is not None            and \
+           self.__pageOverlay is overlay  and \
+           not idle.inIdle(self.__updateTask):
+            self.__updateTitle()
+        else:
+            self.__scheduleUpdate()
+
+
+    def __updateTitle(self):
+        """Called by :meth:`__overlayNameChanged` when the ``wx.html2``
+        renderer is in use. Patches the new overlay name into the title of
+        the current page via JavaScript, instead of re-generating the entire
+        page.
+        """
+
+        oldName = self.__pageName
+        newName = self.__currentDisplay.name
+
+        self.__pageName = newName
+
+        # Titles which do not start with
+        # the overlay name are left as-is
+        self.__info.RunScript(
+            'var h = document.querySelector("h2");'
+            'var o = {0};'
+            'var n = {1};'
+            'if (h && h.textContent.indexOf(o + " - ") === 0) '
+            'h.textContent = n + h.textContent.slice(o.length);'.format(
+                json.dumps(oldName), json.dumps(newName)))
 
 
     def __overlayOptsChanged(self, *a):
@@ -244,32 +375,167 @@ class OverlayInfoPanel(fslpanel.FSLeyesPanel):
         overlay change. Updates the information display. The properties that
         trigger a refresh are  defined in the :attr:`_optProps` dictionary.
         """
-        self.__updateInformation()
+        self.__clearCache(self.__currentOverlay)
+        self.__scheduleUpdate()
+
+
+    def __overlayChanged(self, *a):
+        """Called when the current overlay is saved, or its transform changes
+        (see :attr:`_overlayTopics`). Updates the information display.
+        """
+        self.__clearCache(self.__currentOverlay)
+        self.__scheduleUpdate()
+
+
+    def __scheduleUpdate(self):
+        """Schedules a call to :meth:`__updateInformation` on the
+        :func:`.idle.idle` loop. Multiple changes which occur before the
+        update is run are coalesced into a single update.
+        """
+        idle.idle(self.__updateInformation,
+                  name=self.__updateTask,
+                  skipIfQueued=True)
+
+
+    def __clearCache(self, overlay):
+        """Removes all cached HTML pages for the given overlay. """
+
+        ovid = id(overlay)
+
+        for key in list(self.__htmlCache.keys()):
+            if key[0] == ovid:
+                self.__htmlCache.pop(key)
+
+
+    def __cacheKey(self, overlay, display):
+        """Returns a key for the HTML cache, which identifies the information
+        that is shown for the given overlay.
+
+        The key includes properties of other overlays which are shown on the
+        page, but which are not watched for changes - the display name of
+        the display space image, and the name, data source and transform
+        of image-valued :class:`.DisplayOpts` properties (e.g. the reference
+        image of a mesh).
+        """
+
+        displayCtx   = self.displayCtx
+        opts         = display.opts
+        optVals      = []
+        displaySpace = displayCtx.displaySpace
+
+        for propName in self.__getOptProps(overlay):
+            val = getattr(opts, propName)
+
+            if isinstance(val, fslimage.Nifti):
+                val = (id(val),
+                       val.name,
+                       val.dataSource,
+                       getattr(displayCtx.getOpts(val), 'transform', None))
+
+            optVals.append(val)
+
+        if isinstance(displaySpace, fslimage.Nifti):
+            displaySpace = (id(displaySpace),
+                            displayCtx.getDisplay(displaySpace).name)
+
+        return (id(overlay),
+                getattr(overlay, 'dataSource', None),
+                display.overlayType,
+                display.name,
+                tuple(optVals),
+                displaySpace)
 
 
     def __updateInformation(self):
         """Refreshes the information shown on this ``OverlayInfoPanel``.
-        Called by the :meth:`__selectedOverlayChanged` and
-        :meth:`__overlayNameChanged` methods.
+        Called via :meth:`__scheduleUpdate` by the
+        :meth:`__selectedOverlayChanged`, :meth:`__overlayNameChanged`,
+        :meth:`__overlayOptsChanged` and :meth:`__overlayChanged` methods.
         """
 
+        # This panel may have been destroyed
+        # before the update was run
+        if self.destroyed:
+            return
+
         overlay   = self.__currentOverlay
         display   = self.__currentDisplay
-        infoFunc  = '_{}__get{}Info'.format(type(self)   .__name__,
-                                            type(overlay).__name__)
-        infoFunc  = getattr(self, infoFunc, None)
-
-        # Overlay is none, or the overlay
-        # type is not supported
-        if infoFunc is None:
-            self.__info.SetPage('', '')
-            self.__info.Refresh()
-            return
 
-        info = infoFunc(overlay, display)
+        # Or the overlay list may have
+        # been cleared in the meantime
+        if self.displayCtx.getSelectedOverlay() is not overlay:
+            overlay = None
+
+        if overlay is None: key = None
+        else:               key = self.__cacheKey(overlay, display)
+
+        html = self.__htmlCache.pop(key, None)
+
+        if html is None:
+            infoFunc = self.__getInfoFunc(overlay)
+
+            # Overlay is none, or the overlay
+            # type is not supported
+            if infoFunc is None:
+                self.__setPage('')
+                return
+
+            html = self.__formatOverlayInfo(infoFunc(self, overlay, display))
+
+        # The page is (re-)inserted at the end
+        # of the cache, so the cache is ordered
+        # from least to most recently used, and
+        # the least recently used page is
+        # discarded when the cache is full.
+        self.__htmlCache[key] = html
+        if len(self.__htmlCache) > HTML_CACHE_SIZE:
+            self.__htmlCache.popitem(last=False)
+
+        self.__setPage(html, overlay, display.name)
+
+
+    _infoFuncs = {}
+    """Cache used by the :meth:`__getInfoFunc` method, containing
+    ``{(panelType, overlayType) : function}`` mappings.
+    """
+
+
+    def __getInfoFunc(self, overlay):
+        """Returns the ``__get*Info`` method for the given overlay, as an
+        unbound function, or ``None`` if the overlay type is not supported.
+        The method is only looked up once for each overlay type.
+        """
+
+        key      = (type(self), type(overlay))
+        infoFunc = OverlayInfoPanel._infoFuncs.get(key, False)
+
+        if infoFunc is False:
+            infoFunc = '_{}__get{}Info'.format(type(self)   .__name__,
+                                               type(overlay).__name__)
+            infoFunc = getattr(type(self), infoFunc, None)
+            OverlayInfoPanel._infoFuncs[key] = infoFunc
+
+        return infoFunc
+
+
+    def __setPage(self, html, overlay=None, name=None):
+        """Displays the given HTML. The HTML window is frozen while the
+        page is set, so that it is only redrawn once.
+
+        :arg html:    The HTML to display
+        :arg overlay: The overlay the page is for, if any.
+        :arg name:    Name of the overlay the page is for, if any.
+        """
+
+        self.__pageOverlay = overlay
+        self.__pageName    = name
 
-        self.__info.SetPage(self.__formatOverlayInfo(info), '')
-        self.__info.Refresh()
+        self.__info.Freeze()
+
+        try:
+            self.__info.SetPage(html, '')
+        finally:
+            self.__info.Thaw()
 
 
     def __getImageInfo(self, overlay, display):
@@ -285,16 +551,19 @@ class OverlayInfoPanel(fslpanel.FSLeyesPanel):
         hdr     = overlay.header
         isNifti = overlay.niftiVersion >= 1
         opts    = display.opts
+        nifti   = strings.nifti
+        anatomy = strings.anatomy
 
         if isNifti: title = strings.labels[self, overlay]
         else:       title = strings.labels[self, 'Analyze']
 
-        info = OverlayInfo('{} - {}'.format(display.name, title))
+        info   = OverlayInfo('{} - {}'.format(display.name, title))
+        labels = self.__getImageLabels(overlay)
 
-        generalSect = strings.labels[self,          'general']
-        dimSect     = strings.labels[self, overlay, 'dimensions']
-        xformSect   = strings.labels[self, overlay, 'transform']
-        orientSect  = strings.labels[self, overlay, 'orient']
+        generalSect = labels['general']
+        dimSect     = labels['dimensions']
+        xformSect   = labels['transform']
+        orientSect  = labels['orient']
 
         info.addSection(generalSect)
         info.addSection(dimSect)
@@ -318,52 +587,51 @@ class OverlayInfoPanel(fslpanel.FSLeyesPanel):
                              opts.transform,
                              self.displayCtx.displaySpace))
 
-        dataType = strings.nifti.get(('datatype', int(hdr['datatype'])),
-                                     'Unknown')
+        dataType = nifti.get(('datatype', int(hdr['datatype'])), 'Unknown')
 
-        info.addInfo(strings.labels[self, 'niftiVersion'],
-                     strings.nifti['version.{}'.format(overlay.niftiVersion)],
+        info.addInfo(labels['niftiVersion'],
+                     nifti['version.{}'.format(overlay.niftiVersion)],
                      section=generalSect)
-        info.addInfo(strings.labels[self, 'dataSource'],
+        info.addInfo(labels['dataSource'],
                      overlay.dataSource,
                      section=generalSect)
-        info.addInfo(strings.nifti['datatype'],
+        info.addInfo(nifti['datatype'],
                      dataType,
                      section=generalSect)
-        info.addInfo(strings.nifti['descrip'],
+        info.addInfo(nifti['descrip'],
                      overlay.strval('descrip'),
                      section=generalSect)
 
         if isNifti:
-            intent = strings.nifti.get(
+            intent = nifti.get(
                 ('intent_code', int(hdr['intent_code'])),
                 'Unknown')
 
-            info.addInfo(strings.nifti['intent_code'],
+            info.addInfo(nifti['intent_code'],
                          intent,
                          section=generalSect)
-            info.addInfo(strings.nifti['intent_name'],
+            info.addInfo(nifti['intent_name'],
                          overlay.strval('intent_name'),
                          section=generalSect)
 
-        info.addInfo(strings.nifti['aux_file'],
+        info.addInfo(nifti['aux_file'],
                      overlay.strval('aux_file'),
                      section=generalSect)
 
-        info.addInfo(strings.labels[self, 'overlayType'],
+        info.addInfo(labels['overlayType'],
                      strings.choices[display, 'overlayType'][
                          display.overlayType],
                      section=generalSect)
-        info.addInfo(strings.labels[self, 'displaySpace'],
+        info.addInfo(labels['displaySpace'],
                      displaySpace,
                      section=generalSect)
 
-        info.addInfo(strings.nifti['dimensions'],
+        info.addInfo(nifti['dimensions'],
                      '{}D'.format(len(overlay.shape)),
                      section=dimSect)
 
         for i in range(len(overlay.shape)):
-            info.addInfo(strings.nifti['dim{}'.format(i + 1)],
+            info.addInfo(nifti['dim{}'.format(i + 1)],
                          str(overlay.shape[i]),
                          section=dimSect)
 
@@ -379,18 +647,23 @@ class OverlayInfoPanel(fslpanel.FSLeyesPanel):
             voxUnits, timeUnits = 2, 8
 
         # Convert the unit codes into labels
-        voxUnits  = strings.nifti.get(('xyz_unit', voxUnits),  'INVALID CODE')
-        timeUnits = strings.nifti.get(('t_unit',   timeUnits), 'INVALID CODE')
+        voxUnits  = nifti.get(('xyz_unit', voxUnits),  'INVALID CODE')
+        timeUnits = nifti.get(('t_unit',   timeUnits), 'INVALID CODE')
 
-        for i in range(len(overlay.shape)):
+        # The pixdim field is read from the
+        # header once, and the units for the
+        # first four dimensions are looked
+        # up by index in the loop.
+        pixdims = np.asarray(hdr['pixdim'])[1:1 + len(overlay.shape)]
+        units   = [voxUnits, voxUnits, voxUnits, timeUnits]
 
-            pixdim = hdr['pixdim'][i + 1]
+        for i, pixdim in enumerate(pixdims):
 
-            if   i  < 3: pixdim = '{:0.4g} {}'.format(pixdim, voxUnits)
-            elif i == 3: pixdim = '{:0.4g} {}'.format(pixdim, timeUnits)
+            if i < 4:
+                pixdim = '{:0.4g} {}'.format(pixdim, units[i])
 
             info.addInfo(
-                strings.nifti['pixdim{}'.format(i + 1)],
+                nifti['pixdim{}'.format(i + 1)],
                 pixdim,
                 section=dimSect)
 
@@ -403,20 +676,20 @@ class OverlayInfoPanel(fslpanel.FSLeyesPanel):
             qformCode = int(hdr['qform_code'])
             sformCode = int(hdr['sform_code'])
 
-            info.addInfo(strings.nifti['transform'],
+            info.addInfo(nifti['transform'],
                          self.__formatArray(overlay.voxToWorldMat),
                          section=xformSect)
 
-            info.addInfo(strings.nifti['sform_code'],
-                         strings.anatomy['Nifti', 'space', sformCode],
+            info.addInfo(nifti['sform_code'],
+                         anatomy['Nifti', 'space', sformCode],
                          section=xformSect)
-            info.addInfo(strings.nifti['qform_code'],
-                         strings.anatomy['Nifti', 'space', qformCode],
+            info.addInfo(nifti['qform_code'],
+                         anatomy['Nifti', 'space', qformCode],
                          section=xformSect)
 
             if sformCode != constants.NIFTI_XFORM_UNKNOWN:
                 sform = img.get_sform()
-                info.addInfo(strings.nifti['sform'],
+                info.addInfo(nifti['sform'],
                              self.__formatArray(sform),
                              section=xformSect)
 
@@ -427,14 +700,14 @@ class OverlayInfoPanel(fslpanel.FSLeyesPanel):
                     log.warning('Could not read qform from {}: {}'.format(
                         overlay.name, str(e)))
                     qform = np.eye(4) * np.nan
-                info.addInfo(strings.nifti['qform'],
+                info.addInfo(nifti['qform'],
                              self.__formatArray(qform),
                              section=xformSect)
 
         # For ANALYZE images, we show
         # the scale/offset matrix
         else:
-            info.addInfo(strings.nifti['affine'],
+            info.addInfo(nifti['affine'],
                          self.__formatArray(hdr.get_best_affine()),
                          section=xformSect)
 
@@ -442,35 +715,80 @@ class OverlayInfoPanel(fslpanel.FSLeyesPanel):
             storageOrder = 'unknown'
         elif overlay.isNeurological(): storageOrder = 'neuro'
         else:                          storageOrder = 'radio'
-        storageOrder = strings.nifti['storageOrder.{}'.format(storageOrder)]
+        storageOrder = nifti['storageOrder.{}'.format(storageOrder)]
 
-        info.addInfo(strings.nifti['storageOrder'],
+        info.addInfo(nifti['storageOrder'],
                      storageOrder,
                      section=orientSect)
 
+        # The voxel and world orientations
+        # are calculated in a single pass,
+        # and a label is generated once
+        # for each distinct orientation.
+        voxXform     = opts.getTransform('voxel', 'world')
+        worldXform   = np.eye(4)
+        voxOrients   = []
+        worldOrients = []
+        orientLabels = {}
+
         for i in range(3):
-            xform  = opts.getTransform('voxel', 'world')
-            orient = overlay.getOrientation(i, xform)
-            orient = '{} - {}'.format(
-                strings.anatomy['Nifti', 'lowlong',  orient],
-                strings.anatomy['Nifti', 'highlong', orient])
-            info.addInfo(strings.nifti['voxOrient.{}'.format(i)],
-                         orient,
+            voxOrients  .append(overlay.getOrientation(i, voxXform))
+            worldOrients.append(overlay.getOrientation(i, worldXform))
+
+        for orient in set(voxOrients + worldOrients):
+            orientLabels[orient] = '{} - {}'.format(
+                anatomy['Nifti', 'lowlong',  orient],
+                anatomy['Nifti', 'highlong', orient])
+
+        for i, orient in enumerate(voxOrients):
+            info.addInfo(nifti['voxOrient.{}'.format(i)],
+                         orientLabels[orient],
                          section=orientSect)
 
-        for i in range(3):
-            xform  = np.eye(4)
-            orient = overlay.getOrientation(i, xform)
-            orient = '{} - {}'.format(
-                strings.anatomy['Nifti', 'lowlong',  orient],
-                strings.anatomy['Nifti', 'highlong', orient])
-            info.addInfo(strings.nifti['worldOrient.{}'.format(i)],
-                         orient,
+        for i, orient in enumerate(worldOrients):
+            info.addInfo(nifti['worldOrient.{}'.format(i)],
+                         orientLabels[orient],
                          section=orientSect)
 
         return info
 
 
+    _imageLabels = {}
+    """Cache used by the :meth:`__getImageLabels` method, containing
+    ``{type : {key : label}}`` mappings.
+    """
+
+
+    def __getImageLabels(self, overlay):
+        """Used by :meth:`__getImageInfo`. Returns a dictionary containing
+        section and information labels for the given :class:`.Image`. The
+        labels only depend on the overlay type, so are cached in the
+        :attr:`_imageLabels` dictionary.
+        """
+
+        otype  = type(overlay)
+        labels = OverlayInfoPanel._imageLabels.get(otype, None)
+
+        if labels is not None:
+            return labels
+
+        labels = {}
+
+        for key in ('general',
+                    'niftiVersion',
+                    'dataSource',
+                    'overlayType',
+                    'displaySpace'):
+            labels[key] = strings.labels[self, key]
+
+        for key in ('dimensions', 'transform', 'orient'):
+            labels[key] = strings.labels[self, overlay, key]
+
+        OverlayInfoPanel._imageLabels[otype] = labels
+
+        return labels
+
+
     def __getFEATImageInfo(self, overlay, display):
         """Creates and returns an :class:`OverlayInfo` object containing
         information about the given :class:`.FEATImage` overlay.
@@ -502,8 +820,10 @@ class OverlayInfoPanel(fslpanel.FSLeyesPanel):
         secName = strings.labels[self, overlay, 'featInfo']
         info.addSection(secName)
 
+        feat = strings.feat
+
         for k, v in featInfo:
-            info.addInfo(strings.feat[k], v, section=secName)
+            info.addInfo(feat[k], v, section=secName)
 
         return info
 
@@ -538,8 +858,10 @@ class OverlayInfoPanel(fslpanel.FSLeyesPanel):
         secName = strings.labels[self, overlay, 'melodicInfo']
         info.addSection(secName)
 
+        melodic = strings.melodic
+
         for k, v in melInfo:
-            info.addInfo(strings.melodic[k], v, section=secName)
+            info.addInfo(melodic[k], v, section=secName)
 
         return info
 
@@ -555,6 +877,7 @@ class OverlayInfoPanel(fslpanel.FSLeyesPanel):
 
         opts   = display.opts
         refImg = opts.refImage
+        labels = strings.labels
 
         modelInfo = [
             ('numVertices',  overlay.vertices.shape[0]),
@@ -563,15 +886,15 @@ class OverlayInfoPanel(fslpanel.FSLeyesPanel):
 
         if refImg is None:
             modelInfo.append(
-                ('displaySpace', strings.labels[
+                ('displaySpace', labels[
                     self, overlay, 'coordSpace', 'display']))
         else:
 
             refOpts      = self.displayCtx.getOpts(refImg)
             dsImg        = self.displayCtx.displaySpace
-            displaySpace = strings.labels[
+            displaySpace = labels[
                 self, refImg, 'displaySpace', refOpts.transform]
-            coordSpace   = strings.labels[
+            coordSpace   = labels[
                 self, overlay,
                 'coordSpace', opts.coordSpace].format(refImg.name)
 
@@ -585,12 +908,12 @@ class OverlayInfoPanel(fslpanel.FSLeyesPanel):
 
         info = OverlayInfo('{} - {}'.format(
             display.name,
-            strings.labels[self, overlay]))
+            labels[self, overlay]))
 
-        info.addInfo(strings.labels[self, 'dataSource'], overlay.dataSource)
+        info.addInfo(labels[self, 'dataSource'], overlay.dataSource)
 
         for name, value in modelInfo:
-            info.addInfo(strings.labels[self, overlay, name], value)
+            info.addInfo(labels[self, overlay, name], value)
 
         return info
 
@@ -650,21 +973,18 @@ class OverlayInfoPanel(fslpanel.FSLeyesPanel):
         formats the data in the given ``numpy.array``.
         """
 
-        lines = []
-
-        lines.append('<table border="0" style="font-size: small;">')
+        # The array is converted into nested lists
+        # in one pass, rather than indexing each
+        # element of the array individually.
+        rows = []
+        fmt  = '<td>{:0.4g}</td>'.format
 
-        for rowi in range(array.shape[0]):
+        for row in np.asarray(array).tolist():
+            cells = [fmt(val) for val in row]
+            rows.append('<tr>{}</tr>'.format(''.join(cells)))
 
-            lines.append('<tr>')
-
-            for coli in range(array.shape[1]):
-                lines.append('<td>{:0.4g}</td>'.format(array[rowi, coli]))
-            lines.append('</tr>')
-
-        lines.append('</table>')
-
-        return ''.join(lines)
+        return ('<table border="0" style="font-size: small;">'
+                '{}</table>'.format(''.join(rows)))
 
 
     def __formatOverlayInfo(self, info):
@@ -678,15 +998,17 @@ class OverlayInfoPanel(fslpanel.FSLeyesPanel):
                      'sans-serif; font-size: small;">')
         lines.append('<h2>{}</h2>'.format(info.title))
 
+        # The section dictionaries are iterated
+        # over directly, rather than being
+        # copied into lists of items.
         sections = []
 
         if len(info.info) > 0:
-            sections.append((None, list(info.info.items())))
+            sections.append((None, info.info))
 
-        for secName, secInf in info.sections.items():
-            sections.append((secName, list(secInf.items())))
+        sections.extend(info.sections.items())
 
-        for i, (secName, secInf) in enumerate(sections):
+        for secName, secInf in sections:
 
             lines.append('<div style="float:left; margin: 5px; '
                          'background-color: #f0f0f0;">')
@@ -696,17 +1018,12 @@ class OverlayInfoPanel(fslpanel.FSLeyesPanel):
 
             lines.append('<table border="0" style="font-size: small;">')
 
-            for i, (infName, infData) in enumerate(secInf):
+            for i, (infName, infData) in enumerate(secInf.items()):
 
-                if i % 2: bgColour = '#f0f0f0'
-                else:     bgColour = '#cdcdff'
+                if i % 2: row = _ROW_ODD
+                else:     row = _ROW_EVEN
 
-                lines.append('<tr bgcolor="{}">'
-                             '<td><b>{}</b></td>'
-                             '<td>{}</td></tr>'.format(
-                                 bgColour,
-                                 infName,
-                                 infData))
+                lines.append(row.format(infName, infData))
 
             lines.append('</table>')
             lines.append('</div>')
@@ -714,7 +1031,7 @@ class OverlayInfoPanel(fslpanel.FSLeyesPanel):
 
         lines.append('</body></html>')
 
-        return '\n'.join(lines)
+        return ''.join(lines)
 
 
 class OverlayInfo(object):
@@ -118,16 +118,30 @@ class LookupTableTexture(texture.Texture):
         nvals  = lut.max() + 1
         data   = np.zeros((nvals, 4), dtype=np.uint8)
 
-        for lbl in lut:
+        # All labels are processed at once,
+        # from the arrays cached by the lut
+        values, colours, enabled = lut.asArrays()
 
-            value  = lbl.value
-            colour = fslcmaps.applyBricon(lbl.colour, brightness, contrast)
+        # If brightness/contrast are not being
+        # applied, we can use the 8 bit RGBA
+        # colours which are cached by the lut
+        if brightness == 0.5 and contrast == 0.5:
+            data[values] = lut.asRGBA()
 
-            data[value, :3] = [np.floor(c * 255) for c in colour[:3]]
+            if alpha is not None:
+                data[values[enabled], 3] = 255 * alpha
 
-            if not lbl.enabled:     data[value, 3] = 0
-            elif alpha is not None: data[value, 3] = 255 * alpha
-            else:                   data[value, 3] = 255
+        else:
+            colours = fslcmaps.applyBricon(colours[:, :3],
+                                           brightness,
+                                           contrast)
+
+            data[values, :3] = np.floor(colours * 255)
+
+            if alpha is not None: data[values, 3] = 255 * alpha
+            else:                 data[values, 3] = 255
+
+            data[values[~enabled], 3] = 0
 
         data = data.ravel('C')
 
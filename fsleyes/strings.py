@@ -745,6 +745,7 @@ labels = TypeDict({
     'ResampleDialog.cancel'        : 'Cancel',
     'ResampleDialog.interpolation' : 'Interpolation',
     'ResampleDialog.smoothing'     : 'Smoothing',
+    'ResampleDialog.allVolumes'    : 'Resample all volumes',
     'ResampleDialog.dtype'         : 'Data type',
     'ResampleDialog.nearest'       : 'Nearest neighbour',
     'ResampleDialog.linear'        : 'Linear',
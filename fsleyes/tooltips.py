@@ -756,4 +756,7 @@ misc = TypeDict({
     'voxels. This setting has no effect when using nearest neighbour '
     'interpolation, and is only applied along axes which are being '
     'down-sampled.',
+    'ResampleDialog.allVolumes' :
+    'If selected, every volume of a 4D image is resampled. Otherwise, only '
+    'the currently displayed volume is resampled.',
 })
@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+#
+# test_colourmaps.py -
+#
+# Author: Paul McCarthy <pauldmccarthy@gmail.com>
+#
+
+
+import os.path as op
+
+try:
+    import unittest.mock as mock
+except ImportError:
+    import mock
+
+import numpy  as np
+import pytest
+
+import fsleyes.colourmaps as fslcm
+
+from . import tempdir
+
+
+LUT = """
+1 0.0 0.0 0.0 Zero and one
+2 1.0 0.5 0.25 Two
+5 0.5 0.5 0.5 Five
+20 0.2 0.4 0.6 Twenty
+"""
+
+
+def _makeLut(contents):
+    with open('test.lut', 'wt') as f:
+        f.write(contents)
+    return fslcm.LookupTable('lut', 'lut', op.abspath('test.lut'))
+
+
+def test_load():
+
+    with tempdir():
+        lut = _makeLut(LUT)
+
+        assert len(lut) == 4
+        assert [l.value for l in lut.labels()] == [1, 2, 5, 20]
+        assert lut.get(1).name  == 'Zero and one'
+        assert lut.get(20).name == 'Twenty'
+        assert np.allclose(lut.get(2).colour, (1.0, 0.5, 0.25, 1.0))
+
+
+def test_load_unsorted():
+
+    lines = LUT.strip().split('\n')
+    lines = [lines[2], lines[0], lines[3], lines[1]]
+
+    with tempdir(), mock.patch.object(fslcm.log, 'warning') as warning:
+        lut = _makeLut('\n'.join(lines))
+
+        assert [l.value for l in lut.labels()] == [1, 2, 5, 20]
+        assert [l.name  for l in lut.labels()] == ['Zero and one',
+                                                   'Two',
+                                                   'Five',
+                                                   'Twenty']
+        assert warning.call_count == 1
+        assert list(lut.asArrays()[0]) == [1, 2, 5, 20]
+
+
+def test_load_bad():
+
+    with tempdir():
+        lut = _makeLut(LUT + '5 1.0 1.0 1.0 Duplicate\n')
+        with pytest.raises(ValueError):
+            len(lut)
+
+        lut = _makeLut(LUT + '-1 1.0 1.0 1.0 Negative\n')
+        with pytest.raises(ValueError):
+            len(lut)
+
+
+def test_asArrays():
+
+    with tempdir():
+        lut = _makeLut(LUT)
+
+        values, colours, enabled = lut.asArrays()
+
+        assert values.dtype  == np.int32
+        assert colours.shape == (4, 4)
+        assert list(values)  == [1, 2, 5, 20]
+        assert np.all(enabled)
+        assert np.allclose(colours[:, :3], [[0.0, 0.0, 0.0],
+                                            [1.0, 0.5, 0.25],
+                                            [0.5, 0.5, 0.5],
+                                            [0.2, 0.4, 0.6]])
+
+        for arr in (values, colours, enabled):
+            assert not arr.flags.writeable
+
+        # Previously returned arrays are
+        # never modified - new arrays
+        # are returned after a change
+        lut.get(5).colour  = (1, 0, 0)
+        lut.get(2).enabled = False
+        lut.insert(10, 'Ten', (0, 1, 0))
+        lut.delete(1)
+
+        newvals, newcols, newen = lut.asArrays()
+
+        assert list(values)  == [1, 2, 5, 20]
+        assert np.all(enabled)
+        assert np.allclose(colours[2, :3], (0.5, 0.5, 0.5))
+
+        assert list(newvals) == [2, 5, 10, 20]
+        assert list(newen)   == [False, True, True, True]
+        assert np.allclose(newcols[:, :3], [[1.0, 0.5, 0.25],
+                                            [1.0, 0.0, 0.0],
+                                            [0.0, 1.0, 0.0],
+                                            [0.2, 0.4, 0.6]])
+
+
+def test_asRGBA():
+
+    with tempdir():
+        lut = _makeLut(LUT)
+
+        lut.get(5).enabled = False
+
+        rgba = lut.asRGBA()
+
+        assert rgba.dtype == np.uint8
+        assert not rgba.flags.writeable
+        assert np.all(rgba == [[0,   0,   0,   255],
+                               [255, 127, 63,  255],
+                               [127, 127, 127, 0],
+                               [51,  102, 153, 255]])
+
+        lut.get(5).enabled = True
+        assert lut.asRGBA()[2, 3] == 255
+
+
+def test_indices():
+
+    with tempdir():
+        lut = _makeLut(LUT)
+
+        # integer values use a dense
+        # value -> index table
+        values   = np.array([[1, 5, 3], [20, 21, -4]])
+        expected = [[0, 2, -1], [3, -1, -1]]
+        assert np.all(lut.indices(values) == expected)
+        assert np.all(lut.indices(values.astype(np.uint16)[:, :2]) ==
+                      [[0, 2], [3, -1]])
+
+        # non-integer values are searched for
+        assert np.all(lut.indices(values.astype(np.float32)) == expected)
+        assert np.all(lut.indices([1.5, 2.0, 100.0]) == [-1, 1, -1])
+
+        # The table is updated when
+        # labels are added/removed
+        lut.insert(21, 'Twenty one')
+        lut.delete(5)
+        assert np.all(lut.indices(values) == [[0, -1, -1], [2, 3, -1]])
+
+    lut = fslcm.LookupTable('empty', 'empty')
+    assert np.all(lut.indices([0, 1, 2])       == [-1, -1, -1])
+    assert np.all(lut.indices([0.0, 1.0, 2.0]) == [-1, -1, -1])
+
+
+def test_loadColourMapFile():
+
+    with tempdir():
+        with open('good.cmap', 'wt') as f:
+            f.write('0 0 0\n0.5 0.5 0.5\n1 1 1\n')
+        with open('bad.cmap', 'wt') as f:
+            f.write('0 0 0\n0.5 0.5 abc\n1 1 1\n')
+        with open('ragged.cmap', 'wt') as f:
+            f.write('0 0 0\n0.5 0.5\n1 1 1\n')
+
+        data = fslcm._loadColourMapFile('good.cmap', 0)
+        assert np.allclose(data, [[0, 0, 0], [0.5, 0.5, 0.5], [1, 1, 1]])
+
+        with pytest.raises(ValueError):
+            fslcm._loadColourMapFile('bad.cmap', 0)
+        with pytest.raises(ValueError):
+            fslcm._loadColourMapFile('ragged.cmap', 0)
+
+
+def test_loadColourMapFile_cache():
+
+    with tempdir():
+        fname = op.abspath('cache.cmap')
+
+        with open(fname, 'wt') as f:
+            f.write('0 0 0\n1 1 1\n')
+
+        data1 = fslcm._loadColourMapFile(fname, 1)
+        assert fslcm._loadColourMapFile(fname, 1) is data1
+
+        # Only one entry is kept
+        # for each file, and it is
+        # replaced when the file
+        # modification time changes
+        with open(fname, 'wt') as f:
+            f.write('1 1 1\n0 0 0\n')
+
+        ncached = len(fslcm._cmapFileCache)
+        data2   = fslcm._loadColourMapFile(fname, 2)
+
+        assert np.allclose(data2, [[1, 1, 1], [0, 0, 0]])
+        assert len(fslcm._cmapFileCache) == ncached
+        assert fslcm._cmapFileCache[fname][0] == 2
+        assert fslcm._cmapFileCache[fname][1] is data2
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+#
+# test_overlayinfopanel.py -
+#
+# Author: Paul McCarthy <pauldmccarthy@gmail.com>
+#
+
+import os.path as op
+
+import fsl.data.image as fslimage
+
+from . import run_with_orthopanel, realYield
+
+
+datadir = op.join(op.dirname(__file__), 'testdata')
+
+
+def _pageText(infopanel):
+    return infopanel._OverlayInfoPanel__info.ToText()
+
+
+def _test_displaySpaceRename(panel, overlayList, displayCtx):
+
+    from fsleyes.controls.overlayinfopanel import OverlayInfoPanel
+
+    img1 = fslimage.Image(op.join(datadir, 'av'))
+    img2 = fslimage.Image(op.join(datadir, 'MNI152_T1_2mm_brain'))
+
+    overlayList.extend((img1, img2))
+
+    displayCtx.displaySpace = img1
+
+    panel.togglePanel(OverlayInfoPanel)
+    infopanel = panel.getPanel(OverlayInfoPanel)
+
+    displayCtx.selectOverlay(img2)
+    realYield(50)
+    assert displayCtx.getOpts(img2).transform == 'reference'
+    assert displayCtx.getDisplay(img1).name in _pageText(infopanel)
+
+    # The page for img2 shows the name of
+    # the display space image - renaming
+    # it must not result in a stale page
+    # being shown when img2 is re-selected
+    displayCtx.selectOverlay(img1)
+    realYield(50)
+    displayCtx.getDisplay(img1).name = 'renamedDisplaySpace'
+    realYield(50)
+    displayCtx.selectOverlay(img2)
+    realYield(50)
+
+    assert 'renamedDisplaySpace' in _pageText(infopanel)
+
+
+def test_displaySpaceRename():
+    run_with_orthopanel(_test_displaySpaceRename)
@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+#
+# test_resample.py -
+#
+# Author: Paul McCarthy <pauldmccarthy@gmail.com>
+#
+
+
+import itertools as it
+
+try:
+    import unittest.mock as mock
+except ImportError:
+    import mock
+
+import numpy         as np
+import scipy.ndimage as ndimage
+
+import fsl.data.image           as fslimage
+import fsleyes.actions.resample as resample
+
+
+SHAPES = [((8,  9,  7), (16, 18, 14)),
+          ((8,  9,  7), (4,  3,  7)),
+          ((10, 12, 6), (7,  25, 6)),
+          ((5,  6,  7), (13, 4,  9)),
+          ((9,  9,  9), (20, 20, 20))]
+
+
+KERNELS = [(0, resample._resampleNearest),
+           (1, resample._resampleLinear),
+           (3, resample._resampleCubic)]
+
+
+def _reference(data, newShape, order, smooth, dtype=None):
+    """Resamples ``data`` in the same way as ``Image.resample``. """
+
+    if dtype is None:
+        dtype = data.dtype
+
+    oldShape = np.array(data.shape, dtype=np.float64)
+    newShape = np.array(newShape,   dtype=np.float64)
+    ratio    = oldShape / newShape
+    data     = np.array(data, dtype=np.float64)
+
+    if order > 0 and smooth:
+        data = ndimage.gaussian_filter(data, resample._smoothingSigma(ratio))
+
+    data = ndimage.affine_transform(data,
+                                    ratio,
+                                    output_shape=tuple(newShape.astype(int)),
+                                    order=order,
+                                    mode='constant')
+
+    return resample._castResult(data, dtype), ratio
+
+
+def test_kernels():
+
+    np.random.seed(1)
+
+    for (oldShape, newShape), (order, kernel), smooth in it.product(
+            SHAPES, KERNELS, [False, True]):
+
+        data            = np.random.random(oldShape) * 100
+        expected, ratio = _reference(data, newShape, order, smooth)
+        result          = kernel(data, newShape, ratio, smooth)
+
+        assert result.shape == expected.shape
+        assert result.dtype == data.dtype
+        assert np.allclose(result, expected, atol=1e-6)
+
+
+def test_kernels_pool():
+
+    import multiprocessing.pool as mppool
+
+    np.random.seed(2)
+
+    data = np.random.random((12, 10, 8)) * 100
+    pool = mppool.ThreadPool(3)
+
+    try:
+        for order, kernel in KERNELS:
+            expected, ratio = _reference(data, (5, 21, 8), order, True)
+            result          = kernel(data, (5, 21, 8), ratio, True, pool)
+            assert np.allclose(result, expected, atol=1e-6)
+    finally:
+        pool.close()
+
+
+def test_kernels_dtypes():
+
+    np.random.seed(3)
+
+    # Integer data is interpolated in float32,
+    # and uint8 linear interpolation uses fixed
+    # point weights, so results may be off by
+    # one after rounding.
+    tols = {np.uint8   : 1,
+            np.int16   : 1,
+            np.int32   : 0,
+            np.float32 : 1e-3}
+
+    for dtype, (order, kernel), smooth in it.product(
+            tols.keys(), KERNELS, [False, True]):
+
+        data            = np.random.randint(0, 250, (9, 8, 10)).astype(dtype)
+        expected, ratio = _reference(data, (4, 17, 10), order, smooth)
+        result          = kernel(data, (4, 17, 10), ratio, smooth)
+
+        assert result.dtype == dtype
+        assert np.all(np.abs(result.astype(np.float64) -
+                             expected.astype(np.float64)) <= tols[dtype])
+
+
+def test_kernels_clip():
+
+    # Cubic interpolation overshoots, so
+    # integer outputs must be clipped to
+    # the range of the type
+    data            = np.zeros((10, 10, 10), dtype=np.uint8)
+    data[3:7, ...]  = 255
+    expected, ratio = _reference(data, (23, 10, 10), 3, False)
+    result          = resample._resampleCubic(data, (23, 10, 10), ratio, False)
+
+    assert result.dtype == np.uint8
+    assert result.max() == 255
+    assert np.all(np.abs(result.astype(np.int32) -
+                         expected.astype(np.int32)) <= 1)
+
+
+def test_insideLength():
+
+    assert resample._insideLength(5, 5,  1.0)      == 5
+    assert resample._insideLength(5, 10, 0.5)      == 9
+    assert resample._insideLength(5, 2,  2.5)      == 2
+    assert resample._insideLength(5, 13, 5 / 13.0) == 11
+
+
+def test_resample_cast():
+
+    np.random.seed(4)
+
+    data = np.random.random((10, 11, 12)) * 250
+    img  = fslimage.Image(data)
+
+    with mock.patch('fsleyes.actions.resample._importCuPy',
+                    return_value=(None, None)):
+
+        for order, dtype in it.product([0, 1, 3],
+                                       [np.int16, np.float32, np.uint8]):
+
+            got, xform = resample.resample(
+                img, (6, 15, 12), dtype=dtype, order=order)
+            expected   = _reference(np.array(data, dtype=dtype),
+                                    (6, 15, 12),
+                                    order,
+                                    True)[0]
+
+            assert got.dtype == dtype
+            assert got.shape == (6, 15, 12)
+            assert np.all(np.abs(got.astype(np.float64) -
+                                 expected.astype(np.float64)) <= 1)
+            assert np.allclose(xform, np.diag([10 / 6.0, 11 / 15.0, 1, 1]))
+
+
+def test_resample_4d():
+
+    np.random.seed(5)
+
+    data = np.random.random((7, 8, 9, 4)) * 100
+    img  = fslimage.Image(data)
+
+    for threshold in (resample.MEMMAP_THRESHOLD, 0):
+        with mock.patch('fsleyes.actions.resample._importCuPy',
+                        return_value=(None, None)), \
+             mock.patch('fsleyes.actions.resample.MEMMAP_THRESHOLD',
+                        threshold):
+
+            got, xform = resample.resample(img, (14, 4, 9), order=1)
+
+            assert got.shape == (14, 4, 9, 4)
+            assert isinstance(got, np.memmap) == (threshold == 0)
+
+            for vol in range(4):
+                expected = _reference(data[..., vol], (14, 4, 9), 1, True)[0]
+                assert np.allclose(got[..., vol], expected, atol=1e-6)
+
+            assert np.allclose(xform, np.diag([0.5, 2, 1, 1]))
+
+
+def test_resample_sameShape():
+
+    data = np.random.random((5, 6, 7)).astype(np.float32)
+    img  = fslimage.Image(data)
+
+    got, xform = resample.resample(img, (5, 6, 7), dtype=np.int16)
+
+    assert got.dtype == np.int16
+    assert np.all(got == data.astype(np.int16))
+    assert np.allclose(xform, img.voxToWorldMat)